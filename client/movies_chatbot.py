@@ -1,21 +1,35 @@
+from __future__ import annotations
+
 import os
 import sys
 import asyncio
-import logging
 import hashlib
+import json
+import logging
+import re
 import time
+import threading
+import tempfile
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, AsyncIterator, Callable, Iterator
 from os.path import dirname as up
 
 sys.path.append(os.path.abspath(os.path.join(up(__file__), os.pardir)))
 
+import diskcache
+import numpy as np
 import streamlit as st
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from mcp_use import MCPAgent, MCPClient
 
-from utilities.constants import MCP_CONFIG_FILE_PATH
+from utilities.constants import MCP_CONFIG_FILE_PATH, RESPONSE_CACHE_DIR
+
+# Heavy client libraries are imported where they are first used to keep cold start fast
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    
+    import httpx
+    from langchain_core.messages import BaseMessage
+    from mcp_use import MCPAgent
+    from openai import AsyncOpenAI
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,7 +37,15 @@ logger = logging.getLogger(__name__)
 
 # Performance optimization constants
 CACHE_TTL = 300  # 5 minutes cache TTL
-MAX_CACHE_SIZE = 50  # Maximum cached responses
+MAX_CACHE_SIZE = 50  # Maximum cached responses in the shared semantic cache
+RESPONSE_CACHE_SIZE_LIMIT = int(2e8)  # 200 MB disk budget for the shared response cache
+PREFETCH_QUERY_COUNT = 5  # Sample queries pre-run after agent init
+PREFETCH_CONCURRENCY = 8  # Maximum concurrent prefetch agent runs
+HTTP_TIMEOUT = 60  # Seconds before an OpenAI request times out
+HTTP_MAX_CONNECTIONS = 64  # Pooled keep-alive connections to OpenAI
+EMBEDDING_MODEL = "text-embedding-3-small"  # Model used for semantic cache lookups
+SEMANTIC_SIMILARITY_THRESHOLD = 0.92  # Minimum cosine similarity for a semantic cache hit
+MIN_AIOHTTP_VERSION = (3, 10)  # Older aiohttp releases stall under many concurrent coroutines
 
 # Available OpenAI models
 AVAILABLE_MODELS = {
@@ -38,6 +60,65 @@ AVAILABLE_MODELS = {
     "gpt-5-nano": "GPT-5 Nano"
 }
 
+# Short descriptions of the available models
+MODEL_INFO = {
+    "gpt-4o": "Advanced model with excellent reasoning and multimodal capabilities",
+    "gpt-4o-mini": "Faster, cost-effective version of GPT-4o",
+    "o3": "Latest reasoning model with enhanced problem-solving capabilities",
+    "o3-mini": "Efficient version of o3 model",
+    "gpt-4": "Previous generation flagship model",
+    "gpt-4-mini": "Lightweight version of GPT-4",
+    "gpt-5": "Newest generation model with enhanced capabilities",
+    "gpt-5-mini": "Efficient newest generation model",
+    "gpt-5-nano": "Ultra-efficient newest generation model"
+}
+
+# Static markdown shown in the chat area and sidebar
+WELCOME_MD = """
+👋 **Welcome to the MCP Movies Database Chatbot!**
+
+I can help you explore our movie database using natural language. Here are some things you can ask me:
+
+🎬 **Movie Information**: "Tell me about Inception" or "What's the plot of The Matrix?"
+
+🎭 **By Actor/Director**: "Show me Tom Hanks movies" or "What did Christopher Nolan direct?"
+
+📅 **By Year/Era**: "What movies came out in 2023?" or "Best movies from the 90s"
+
+🏆 **Ratings & Reviews**: "Highest rated sci-fi movies" or "Best action movies"
+
+🔍 **Comparisons**: "Compare Marvel and DC movies" or "Which is better: Star Wars or Star Trek?"
+
+Just type your question below and I'll search the database for you! 🚀
+"""
+
+TIPS_MD = """
+- Be specific in your queries
+- Ask about genres, actors, directors, or years
+- Use natural language - no need for SQL!
+- Try comparative queries like "best rated movies"
+- Ask for recommendations based on preferences
+- Different models may provide varying response styles
+"""
+
+# Static stylesheet for the Streamlit UI
+CSS_FILE_PATH = Path(__file__).parent / "styles.css"
+
+# Follow-up suggestions keyed by the category detected in a recent query
+FOLLOW_UP_SUGGESTIONS = {
+    "director": "What are the highest-rated movies by this director?",
+    "actor": "What other movies feature this actor?",
+    "year": "What were the top movies of that year?",
+    "genre": "Show me more movies in this genre",
+}
+FOLLOW_UP_CATEGORY_RE = re.compile(
+    r"\b(?P<director>directors?)\b"
+    r"|\b(?P<actor>actors?|tom|brad|leonardo|scarlett)\b"
+    r"|\b(?P<year>years?|202[0-4])\b"
+    r"|\b(?P<genre>genres?|action|comedy|drama|sci-?fi)\b",
+    re.IGNORECASE,
+)
+
 # Custom exception classes for better error handling
 class MCPConnectionError(Exception):
     """Raised when MCP connection fails"""
@@ -48,63 +129,197 @@ class LLMInitializationError(Exception):
     pass
 
 # Caching utilities for performance optimization
-def get_query_hash(query: str) -> str:
-    """Generate a hash for query caching"""
-    return hashlib.md5(query.lower().strip().encode()).hexdigest()
-
-def init_cache() -> None:
-    """Initialize response cache in session state"""
-    if "response_cache" not in st.session_state:
-        st.session_state.response_cache = {}
-    if "cache_timestamps" not in st.session_state:
-        st.session_state.cache_timestamps = {}
-
-def get_cached_response(query: str) -> Optional[str]:
+def get_cache_key(query: str) -> str:
+    """Generate a cache key for a query (the normalized query text itself)"""
+    return query.strip().casefold()
+
+def get_cache_scope(agent: MCPAgent, history: Optional[List[BaseMessage]] = None) -> str:
+    """Identify what a cached answer depends on besides the query: the model and the conversation"""
+    context = json.dumps([[m.type, m.content] for m in history or []], default=str)
+    return f"{agent.llm.model_name}:{hashlib.sha256(context.encode()).hexdigest()}"
+
+def get_response_key(query: str, scope: str) -> str:
+    """Generate the response cache key for a query asked within a cache scope"""
+    return f"{scope}:{get_cache_key(query)}"
+
+def is_pending_prompt(prompt: str) -> bool:
+    """Check whether the prompt is already the last, still unanswered, user message"""
+    messages = st.session_state.messages
+    return (
+        bool(messages)
+        and messages[-1]["role"] == "user"
+        and get_cache_key(messages[-1]["content"]) == get_cache_key(prompt)
+    )
+
+def is_answered_prompt(prompt: str) -> bool:
+    """Check whether the last exchange successfully answered the same prompt"""
+    messages = st.session_state.messages
+    return (
+        len(messages) >= 2
+        and messages[-2]["role"] == "user"
+        and get_cache_key(messages[-2]["content"]) == get_cache_key(prompt)
+        and messages[-1]["content"] == st.session_state.get("last_response")
+    )
+
+def record_cache_hit() -> None:
+    """Track cache hits for the chat statistics"""
+    if "cache_hits" not in st.session_state:
+        st.session_state.cache_hits = 0
+    st.session_state.cache_hits += 1
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> diskcache.Cache:
+    """Get the process-wide disk-backed response cache shared by all sessions"""
+    directory = RESPONSE_CACHE_DIR or os.path.join(tempfile.gettempdir(), "movies_cache")
+    return diskcache.Cache(
+        directory,
+        size_limit=RESPONSE_CACHE_SIZE_LIMIT,
+        eviction_policy="least-recently-used",
+    )
+
+def get_cached_response(query: str, scope: str) -> Optional[str]:
     """Get cached response if available and not expired"""
-    init_cache()
-    query_hash = get_query_hash(query)
-    
-    if query_hash in st.session_state.response_cache:
-        timestamp = st.session_state.cache_timestamps.get(query_hash, 0)
-        if time.time() - timestamp < CACHE_TTL:
-            logger.info(f"Cache hit for query: {query[:50]}...")
-            # Track cache hits
-            if "cache_hits" not in st.session_state:
-                st.session_state.cache_hits = 0
-            st.session_state.cache_hits += 1
-            return st.session_state.response_cache[query_hash]
-        else:
-            # Remove expired cache entry
-            del st.session_state.response_cache[query_hash]
-            del st.session_state.cache_timestamps[query_hash]
+    response = get_response_cache().get(get_response_key(query, scope))
     
-    return None
+    if response is not None:
+        logger.info(f"Cache hit for query: {query[:50]}...")
+    return response
 
-def cache_response(query: str, response: str) -> None:
-    """Cache response with timestamp"""
-    init_cache()
-    query_hash = get_query_hash(query)
-    
-    # Implement LRU-like cache size management
-    if len(st.session_state.response_cache) >= MAX_CACHE_SIZE:
-        # Remove oldest entry
-        oldest_hash = min(st.session_state.cache_timestamps.keys(), 
-                         key=lambda k: st.session_state.cache_timestamps[k])
-        del st.session_state.response_cache[oldest_hash]
-        del st.session_state.cache_timestamps[oldest_hash]
-    
-    st.session_state.response_cache[query_hash] = response
-    st.session_state.cache_timestamps[query_hash] = time.time()
+def cache_response(query: str, scope: str, response: str) -> None:
+    """Cache response until CACHE_TTL expires"""
+    get_response_cache().set(get_response_key(query, scope), response, expire=CACHE_TTL)
     logger.info(f"Cached response for query: {query[:50]}...")
 
+# Semantic cache utilities for paraphrased queries
+@st.cache_resource(show_spinner=False)
+def get_semantic_cache() -> Dict[str, Any]:
+    """Get the process-wide semantic cache, only touched from the event loop thread"""
+    # Unit-normalized query embeddings (one row per entry) with their cache scopes,
+    # timestamps and responses
+    return {
+        "embeddings": None,
+        "scopes": [],
+        "timestamps": [],
+        "responses": [],
+    }
+
+def get_embedding_client(agent: MCPAgent) -> AsyncOpenAI:
+    """Get the agent LLM's OpenAI client, which shares its API key and connection pool"""
+    return agent.llm.root_async_client
+
+async def embed_query(agent: MCPAgent, query: str) -> Optional[np.ndarray]:
+    """Embed a query as a unit vector, or return None if embedding fails"""
+    try:
+        result = await get_embedding_client(agent).embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=get_cache_key(query),
+        )
+    except Exception as e:
+        logger.warning(f"Query embedding failed, skipping semantic cache: {str(e)}")
+        return None
+    
+    embedding = np.asarray(result.data[0].embedding, dtype=np.float32)
+    return embedding / np.linalg.norm(embedding)
+
+def get_semantic_cached_response(embedding: np.ndarray, scope: str) -> Optional[str]:
+    """Get the cached response of the most similar previous query in the same scope, if similar enough"""
+    cache = get_semantic_cache()
+    
+    if cache["embeddings"] is None:
+        return None
+    
+    # Rows are unit vectors, so one matrix-vector product gives all cosine similarities
+    similarities = cache["embeddings"] @ embedding
+    now = time.time()
+    for index in np.argsort(similarities)[::-1]:
+        if similarities[index] < SEMANTIC_SIMILARITY_THRESHOLD:
+            break
+        if cache["scopes"][index] == scope and now - cache["timestamps"][index] < CACHE_TTL:
+            logger.info(f"Semantic cache hit (similarity {similarities[index]:.3f})")
+            return cache["responses"][index]
+    
+    return None
+
+def cache_semantic_response(embedding: np.ndarray, scope: str, response: str) -> None:
+    """Cache response keyed by query embedding"""
+    cache = get_semantic_cache()
+    
+    if cache["embeddings"] is None:
+        cache["embeddings"] = embedding[np.newaxis, :]
+    else:
+        cache["embeddings"] = np.vstack([cache["embeddings"], embedding])
+    cache["scopes"].append(scope)
+    cache["timestamps"].append(time.time())
+    cache["responses"].append(response)
+    
+    # Drop the oldest entries once the cache is full
+    if len(cache["responses"]) > MAX_CACHE_SIZE:
+        cache["embeddings"] = cache["embeddings"][-MAX_CACHE_SIZE:]
+        cache["scopes"] = cache["scopes"][-MAX_CACHE_SIZE:]
+        cache["timestamps"] = cache["timestamps"][-MAX_CACHE_SIZE:]
+        cache["responses"] = cache["responses"][-MAX_CACHE_SIZE:]
+
+# Queries currently being processed, shared across sessions so duplicates coalesce
+@st.cache_resource(show_spinner=False)
+def get_in_flight_queries() -> Dict[str, asyncio.Future]:
+    """Get the process-wide map of in-flight query futures keyed by response key"""
+    return {}
+
+# Shared HTTP/2 connection pool for OpenAI requests
+@st.cache_resource(show_spinner=False)
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide async HTTP client, kept open for the life of the process"""
+    import httpx
+    
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        ),
+    )
+
+# Event loop utilities for persistent async resources
+@st.cache_resource(show_spinner=False)
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the process-wide event loop that owns the shared agents, running on its own thread"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="asyncio-io", daemon=True).start()
+    return loop
+
+def run_async(coro):
+    """Run a coroutine on the background event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+def check_aiohttp_version() -> None:
+    """Warn if the installed aiohttp (used by mcp_use) predates the scheduling fixes"""
+    try:
+        import aiohttp
+    except ImportError:
+        return
+    
+    try:
+        version = tuple(int(part) for part in aiohttp.__version__.split(".")[:2])
+    except ValueError:
+        return
+    if version < MIN_AIOHTTP_VERSION:
+        logger.warning(
+            f"aiohttp {aiohttp.__version__} is installed; upgrade to "
+            f">={'.'.join(map(str, MIN_AIOHTTP_VERSION))} to avoid stalls under concurrent queries"
+        )
+
 # Function to initialize MCP agent
-async def init_mcp_agent(model: str = "gpt-4o", api_key: Optional[str] = None) -> Optional[MCPAgent]:
+async def init_mcp_agent(model: str = "gpt-4o",
+                         api_key: Optional[str] = None,
+                         http_client: Optional[httpx.AsyncClient] = None) -> Optional[MCPAgent]:
     """
     Initialize and return the MCP agent with client and LLM.
     
     Args:
         model: OpenAI model to use (default: gpt-4o)
         api_key: OpenAI API key (optional, uses environment variable if not provided)
+        http_client: Shared async HTTP client for OpenAI requests (optional)
     
     Returns:
         MCPAgent: Initialized agent ready for queries
@@ -113,6 +328,11 @@ async def init_mcp_agent(model: str = "gpt-4o", api_key: Optional[str] = None) -
         MCPConnectionError: If MCP client initialization fails
         LLMInitializationError: If LLM initialization fails
     """
+    from langchain_openai import ChatOpenAI
+    from mcp_use import MCPAgent, MCPClient
+    
+    check_aiohttp_version()
+    
     try:
         logger.info(f"Initializing MCP agent with model: {model}")
         
@@ -120,12 +340,7 @@ async def init_mcp_agent(model: str = "gpt-4o", api_key: Optional[str] = None) -
         if not MCP_CONFIG_FILE_PATH or not Path(MCP_CONFIG_FILE_PATH).exists():
             raise MCPConnectionError(f"MCP config file not found: {MCP_CONFIG_FILE_PATH}")
         
-        # Create MCPClient from config file
-        logger.info(f"Loading MCP config from: {MCP_CONFIG_FILE_PATH}")
-        client = MCPClient.from_config_file(str(MCP_CONFIG_FILE_PATH))
-        
-        # Create LLM with error handling
-        logger.info(f"Initializing OpenAI LLM with model: {model}")
+        # Build the LLM settings
         llm_kwargs = {
             "model": model,
             "temperature": 0.1
@@ -136,11 +351,27 @@ async def init_mcp_agent(model: str = "gpt-4o", api_key: Optional[str] = None) -
             llm_kwargs["api_key"] = api_key
             logger.info("Using provided API key")
         
-        llm = ChatOpenAI(**llm_kwargs)
+        # Reuse the shared connection pool if provided
+        if http_client:
+            llm_kwargs["http_async_client"] = http_client
+        
+        # Load the MCP config and create the LLM concurrently, off the event loop
+        logger.info(f"Loading MCP config from: {MCP_CONFIG_FILE_PATH}")
+        logger.info(f"Initializing OpenAI LLM with model: {model}")
+        client, llm = await asyncio.gather(
+            asyncio.to_thread(MCPClient.from_config_file, str(MCP_CONFIG_FILE_PATH)),
+            asyncio.to_thread(ChatOpenAI, **llm_kwargs),
+        )
         
-        # Create agent with the client
+        # Create agent with the client; it is shared by every session, so it keeps
+        # no conversation memory and each query brings its session's history
         logger.info("Creating MCP agent...")
-        agent = MCPAgent(llm=llm, client=client, max_steps=30)
+        agent = MCPAgent(llm=llm, client=client, max_steps=30, memory_enabled=False)
+        
+        # Connect to the MCP servers once, before the agent is shared; concurrent
+        # queries would otherwise each run the unlocked lazy initialization
+        logger.info("Connecting to MCP servers...")
+        await agent.initialize()
         
         logger.info("MCP agent initialized successfully!")
         return agent
@@ -154,18 +385,58 @@ async def init_mcp_agent(model: str = "gpt-4o", api_key: Optional[str] = None) -
         else:
             raise MCPConnectionError(f"Unknown initialization error: {str(e)}")
 
+# Conversation history passed to the shared, memoryless agent
+def build_chat_history(messages: List[Dict[str, str]]) -> List[BaseMessage]:
+    """Convert a session's chat messages into LangChain messages for the agent"""
+    from langchain_core.messages import AIMessage, HumanMessage
+    
+    return [
+        HumanMessage(content=m["content"]) if m["role"] == "user" else AIMessage(content=m["content"])
+        for m in messages
+    ]
+
 # Function to process user query with caching
-async def process_query(agent: MCPAgent, query: str) -> str:
+async def process_query(agent: MCPAgent, query: str,
+                        history: Optional[List[BaseMessage]] = None,
+                        on_cache_hit: Optional[Callable[[], None]] = None) -> str:
     """
     Process user query using the MCP agent with caching support.
     
     Args:
         agent: Initialized MCP agent
         query: User's query string
+        history: Earlier messages of the conversation (optional)
+        on_cache_hit: Called when the response is served from a cache (optional)
         
     Returns:
         str: Agent's response to the query
         
+    Raises:
+        ValueError: If query is empty or agent is None
+        Exception: If query processing fails
+    """
+    return "".join([chunk async for chunk in process_query_stream(agent, query, history, on_cache_hit)])
+
+# Function to stream the response to a user query with caching
+async def process_query_stream(agent: MCPAgent, query: str,
+                               history: Optional[List[BaseMessage]] = None,
+                               on_cache_hit: Optional[Callable[[], None]] = None) -> AsyncIterator[str]:
+    """
+    Stream the response to a user query, serving it from the cache when possible.
+    
+    Cached responses are yielded as a single chunk. Responses are cached only
+    after the stream completes. The stream runs on the background event loop,
+    so it must not touch st.session_state; on_cache_hit is called from there.
+    
+    Args:
+        agent: Initialized MCP agent
+        query: User's query string
+        history: Earlier messages of the conversation (optional)
+        on_cache_hit: Called when the response is served from a cache (optional)
+        
+    Yields:
+        str: Chunks of the agent's response
+        
     Raises:
         ValueError: If query is empty or agent is None
         Exception: If query processing fails
@@ -176,34 +447,168 @@ async def process_query(agent: MCPAgent, query: str) -> str:
     if not query or not query.strip():
         raise ValueError("Query cannot be empty")
     
-    # Check cache first
-    cached_response = get_cached_response(query)
+    # Check cache first; answers are only shared for the same model and conversation
+    scope = get_cache_scope(agent, history)
+    cached_response = get_cached_response(query, scope)
     if cached_response:
-        return cached_response
+        if on_cache_hit:
+            on_cache_hit()
+        yield cached_response
+        return
+    
+    # Share the result of an identical query that is already running
+    cache_key = get_response_key(query, scope)
+    in_flight = get_in_flight_queries()
+    loop = asyncio.get_running_loop()
+    pending = in_flight.get(cache_key)
+    if pending is not None and pending.get_loop() is loop:
+        logger.info(f"Joining in-flight query: {query[:50]}...")
+        yield await asyncio.shield(pending)
+        return
+    
+    future = loop.create_future()
+    in_flight[cache_key] = future
+    try:
+        chunks = []
+        async for chunk in stream_uncached_query(agent, query, history, on_cache_hit):
+            chunks.append(chunk)
+            yield chunk
+        future.set_result("".join(chunks))
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark as retrieved in case no other caller joined
+        raise
+    finally:
+        if not future.done():
+            # The consumer stopped reading before the stream completed
+            future.set_exception(Exception("Failed to process query: request was interrupted"))
+            future.exception()
+        if in_flight.get(cache_key) is future:
+            del in_flight[cache_key]
+
+async def stream_uncached_query(agent: MCPAgent, query: str,
+                                history: Optional[List[BaseMessage]] = None,
+                                on_cache_hit: Optional[Callable[[], None]] = None) -> AsyncIterator[str]:
+    """Stream a query that missed the exact-match cache and cache exactly what was streamed"""
+    # Fall back to a semantic lookup for paraphrased queries
+    scope = get_cache_scope(agent, history)
+    embedding = await embed_query(agent, query)
+    if embedding is not None:
+        cached_response = get_semantic_cached_response(embedding, scope)
+        if cached_response:
+            if on_cache_hit:
+                on_cache_hit()
+            cache_response(query, scope, cached_response)
+            yield cached_response
+            return
     
     try:
         logger.info(f"Processing query: {query[:100]}...")  # Log first 100 chars
         start_time = time.time()
         
-        result = await agent.run(
+        chunks = []
+        final_output = None
+        run_id = None
+        async for event in agent.stream_events(
             query.strip(),
             max_steps=30,
-        )
+            external_history=list(history or []),
+        ):
+            if event["event"] == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content and isinstance(content, str):
+                    # Text from an earlier model step (before a tool call) stays in
+                    # the answer, set apart from the next step's text
+                    if chunks and event.get("run_id") != run_id:
+                        chunks.append("\n\n")
+                        yield "\n\n"
+                    run_id = event.get("run_id")
+                    chunks.append(content)
+                    yield content
+            elif event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                output = event["data"].get("output")
+                if isinstance(output, dict):
+                    final_output = output.get("output")
+        
+        # The response is what the user saw; the final output is only used if nothing streamed
+        result = "".join(chunks) if chunks else final_output if isinstance(final_output, str) else ""
+        if not chunks and result:
+            yield result
         
         processing_time = time.time() - start_time
         logger.info(f"Query processed successfully in {processing_time:.2f}s")
         
         # Cache the response
-        cache_response(query, result)
-        
-        return result
+        cache_response(query, scope, result)
+        if embedding is not None:
+            cache_semantic_response(embedding, scope, result)
         
     except Exception as e:
         logger.error(f"Error processing query: {str(e)}")
         raise Exception(f"Failed to process query: {str(e)}")
 
+def stream_adapter(stream: AsyncIterator[str]) -> Iterator[str]:
+    """Bridge an async stream to a sync generator by driving it on the persistent loop"""
+    done = object()
+    
+    async def next_chunk():
+        try:
+            return await stream.__anext__()
+        except StopAsyncIteration:
+            return done
+    
+    try:
+        while True:
+            chunk = run_async(next_chunk())
+            if chunk is done:
+                return
+            yield chunk
+    finally:
+        run_async(stream.aclose())
+
+# Agents are shared across reruns and sessions with the same configuration; they keep
+# no memory of their own, so conversations never leak between sessions
+@st.cache_resource(show_spinner=False)
+def get_agent(model: str, api_key: Optional[str]) -> MCPAgent:
+    """Get the cached MCP agent for a model and API key, initializing it on first use"""
+    return run_async(init_mcp_agent(model=model, api_key=api_key, http_client=get_http_client()))
+
+# Speculatively pre-run sample queries so button clicks become cache hits
+async def warm_cache(agent: MCPAgent, queries: List[str]) -> None:
+    """
+    Pre-run queries concurrently and populate the response cache.
+    
+    Args:
+        agent: Initialized MCP agent
+        queries: Queries to pre-run
+    """
+    semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+    
+    async def prefetch(query: str) -> str:
+        async with semaphore:
+            # Each sample query is answered as the start of a new conversation
+            return await process_query(agent, query, history=[])
+    
+    logger.info(f"Prefetching {len(queries)} sample queries...")
+    results = await asyncio.gather(*[prefetch(q) for q in queries], return_exceptions=True)
+    
+    failures = [r for r in results if isinstance(r, Exception)]
+    for error in failures:
+        logger.warning(f"Prefetch failed: {str(error)}")
+    logger.info(f"Prefetched {len(queries) - len(failures)}/{len(queries)} sample queries")
+
+@st.cache_resource(show_spinner=False)
+def start_cache_warming(model: str, api_key: Optional[str]) -> Future:
+    """Start prefetching the sample queries for an agent, once per process"""
+    queries = build_sample_queries(())[:PREFETCH_QUERY_COUNT]
+    return asyncio.run_coroutine_threadsafe(warm_cache(get_agent(model, api_key), queries), get_event_loop())
+
 # Original main function (preserved for testing)
 async def main():
+    from dotenv import load_dotenv
+    from langchain_openai import ChatOpenAI
+    from mcp_use import MCPAgent, MCPClient
+    
     # Load environment variables
     load_dotenv()
 
@@ -235,7 +640,8 @@ def display_connection_status() -> None:
     else:
         st.warning("🟡 Initializing...")
 
-def display_model_configuration() -> tuple[str, Optional[str]]:
+@st.fragment
+def display_model_configuration() -> None:
     """Display model and API key configuration UI"""
     st.header("⚙️ Configuration")
     
@@ -276,11 +682,17 @@ def display_model_configuration() -> tuple[str, Optional[str]]:
             if "agent_error" in st.session_state:
                 del st.session_state.agent_error
             st.rerun()
-    
-    return selected_model, api_key_input if api_key_input else None
 
 def get_sample_queries() -> List[str]:
     """Get sample queries for user guidance"""
+    recent_queries = tuple(
+        m["content"] for m in st.session_state.get("messages", [])[-6:] if m["role"] == "user"
+    )
+    return build_sample_queries(recent_queries)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_sample_queries(recent_queries: tuple[str, ...]) -> List[str]:
+    """Build sample queries, adding follow-ups based on recent user queries"""
     base_queries = [
         "Tell me about Lord of the Rings movies",
         "What movies were released in 2022?",
@@ -290,20 +702,13 @@ def get_sample_queries() -> List[str]:
     ]
     
     # Add contextual queries based on chat history
-    if "messages" in st.session_state and st.session_state.messages:
-        recent_queries = [m["content"] for m in st.session_state.messages[-6:] if m["role"] == "user"]
-        
+    if recent_queries:
         # Generate follow-up suggestions based on recent queries
         follow_up_suggestions = []
         for query in recent_queries:
-            if "director" in query.lower():
-                follow_up_suggestions.append("What are the highest-rated movies by this director?")
-            elif "actor" in query.lower() or any(name in query for name in ["tom", "brad", "leonardo", "scarlett"]):
-                follow_up_suggestions.append("What other movies feature this actor?")
-            elif "year" in query.lower() or any(year in query for year in ["2020", "2021", "2022", "2023", "2024"]):
-                follow_up_suggestions.append("What were the top movies of that year?")
-            elif "genre" in query.lower() or any(genre in query.lower() for genre in ["action", "comedy", "drama", "sci-fi"]):
-                follow_up_suggestions.append("Show me more movies in this genre")
+            match = FOLLOW_UP_CATEGORY_RE.search(query)
+            if match:
+                follow_up_suggestions.append(FOLLOW_UP_SUGGESTIONS[match.lastgroup])
         
         # Add unique follow-up suggestions
         for suggestion in follow_up_suggestions[:2]:  # Limit to 2 follow-ups
@@ -312,6 +717,7 @@ def get_sample_queries() -> List[str]:
     
     return base_queries
 
+@st.fragment
 def display_sample_queries() -> None:
     """Display clickable sample queries"""
     st.subheader("💡 Sample Queries")
@@ -323,6 +729,41 @@ def display_sample_queries() -> None:
         with cols[i % 2]:
             if st.button(query, key=f"sample_{i}", use_container_width=True):
                 st.session_state.selected_query = query
+                # Rerun the whole app so the chat area picks up the query
+                st.rerun()
+
+def display_chat_statistics() -> None:
+    """Display chat and cache statistics"""
+    st.header("📊 Chat Statistics")
+    user_messages = len([m for m in st.session_state.messages if m["role"] == "user"])
+    st.metric("Queries Asked", user_messages)
+    st.metric("Total Messages", len(st.session_state.messages))
+    
+    # Cache statistics
+    cache_size = len(get_response_cache())
+    st.metric("Cached Responses", cache_size)
+    if cache_size > 0:
+        cache_hit_rate = st.session_state.get("cache_hits", 0) / max(user_messages, 1) * 100
+        st.metric("Cache Hit Rate", f"{cache_hit_rate:.1f}%")
+
+def display_welcome_message() -> None:
+    """Display the welcome card shown before the first query"""
+    with st.chat_message("assistant"):
+        st.markdown(WELCOME_MD)
+
+def display_chat_history() -> None:
+    """Display previous chat messages in stable, per-message containers"""
+    for i, message in enumerate(st.session_state.messages):
+        # A stable key per message lets the frontend reuse already rendered
+        # turns on rerun instead of rebuilding the whole history
+        with st.container(key=f"message_{i}"):
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+
+@st.cache_resource(show_spinner=False)
+def load_custom_css() -> str:
+    """Load the app's static stylesheet once per process"""
+    return CSS_FILE_PATH.read_text(encoding="utf-8")
 
 # Streamlit chatbot application
 def streamlit_app() -> None:
@@ -335,30 +776,7 @@ def streamlit_app() -> None:
     )
     
     # Custom CSS for better styling
-    st.markdown("""
-    <style>
-    .main-header {
-        background: linear-gradient(90deg, #FF6B6B, #4ECDC4);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 3rem;
-        font-weight: bold;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .chat-container {
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-    .status-container {
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.html(f"<style>{load_custom_css()}</style>")
     
     # Main header
     st.markdown('<h1 class="main-header">🎬 MCP Movies Database Chatbot</h1>', unsafe_allow_html=True)
@@ -380,7 +798,7 @@ def streamlit_app() -> None:
             with st.spinner("🔄 Initializing MCP agent... This may take a moment."):
                 selected_model = st.session_state.get("selected_model", "gpt-4o")
                 api_key = st.session_state.get("custom_api_key", "") or None
-                st.session_state.agent = asyncio.run(init_mcp_agent(model=selected_model, api_key=api_key))
+                st.session_state.agent = get_agent(selected_model, api_key)
         except (MCPConnectionError, LLMInitializationError) as e:
             st.session_state.agent_error = str(e)
             st.error(f"❌ Failed to initialize agent: {str(e)}")
@@ -388,35 +806,23 @@ def streamlit_app() -> None:
             st.session_state.agent_error = f"Unexpected error: {str(e)}"
             st.error(f"❌ Unexpected error: {str(e)}")
     
+    # Warm the cache with sample queries in the background, once per agent
+    if st.session_state.get("agent"):
+        start_cache_warming(
+            st.session_state.get("selected_model", "gpt-4o"),
+            st.session_state.get("custom_api_key", "") or None,
+        )
+    
     # Main chat interface
     chat_container = st.container()
     
     with chat_container:
         # Welcome message for new users
         if not st.session_state.messages and "agent" in st.session_state and st.session_state.agent:
-            with st.chat_message("assistant"):
-                st.markdown("""
-                👋 **Welcome to the MCP Movies Database Chatbot!**
-                
-                I can help you explore our movie database using natural language. Here are some things you can ask me:
-                
-                🎬 **Movie Information**: "Tell me about Inception" or "What's the plot of The Matrix?"
-                
-                🎭 **By Actor/Director**: "Show me Tom Hanks movies" or "What did Christopher Nolan direct?"
-                
-                📅 **By Year/Era**: "What movies came out in 2023?" or "Best movies from the 90s"
-                
-                🏆 **Ratings & Reviews**: "Highest rated sci-fi movies" or "Best action movies"
-                
-                🔍 **Comparisons**: "Compare Marvel and DC movies" or "Which is better: Star Wars or Star Trek?"
-                
-                Just type your question below and I'll search the database for you! 🚀
-                """)
+            display_welcome_message()
         
         # Display chat history
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+        display_chat_history()
     
     # Handle selected query from sidebar
     prompt = None
@@ -431,13 +837,19 @@ def streamlit_app() -> None:
             disabled=("agent" not in st.session_state or st.session_state.agent is None)
         )
     
+    if prompt and is_answered_prompt(prompt):
+        # The same prompt was just answered, so don't send it to the agent again
+        st.toast("ℹ️ That question was just answered above.")
+        prompt = None
+    
     if prompt:
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        
-        # Display user message
-        with st.chat_message("user"):
-            st.markdown(prompt)
+        if not is_pending_prompt(prompt):
+            # Add user message to chat history
+            st.session_state.messages.append({"role": "user", "content": prompt})
+            
+            # Display user message
+            with st.chat_message("user"):
+                st.markdown(prompt)
         
         # Generate and display assistant response
         with st.chat_message("assistant"):
@@ -446,12 +858,24 @@ def streamlit_app() -> None:
             else:
                 with st.spinner("🔍 Searching movies database..."):
                     try:
-                        # Process the query
-                        response = asyncio.run(process_query(st.session_state.agent, prompt))
-                        st.markdown(response)
+                        # The agent sees this session's earlier turns, read here on the
+                        # script thread since the stream runs on the loop thread
+                        history = build_chat_history(st.session_state.messages[:-1])
+                        
+                        # Stream the response as it is generated; cache hits are
+                        # flagged from the loop thread and recorded here
+                        cache_hit = threading.Event()
+                        response = st.write_stream(
+                            stream_adapter(process_query_stream(
+                                st.session_state.agent, prompt, history, on_cache_hit=cache_hit.set
+                            ))
+                        )
+                        if cache_hit.is_set():
+                            record_cache_hit()
                         
                         # Add assistant response to chat history
                         st.session_state.messages.append({"role": "assistant", "content": response})
+                        st.session_state.last_response = response
                     except ValueError as e:
                         error_msg = f"❌ Invalid input: {str(e)}"
                         st.error(error_msg)
@@ -485,7 +909,8 @@ def streamlit_app() -> None:
                         with st.spinner("🔄 Reconnecting with current settings..."):
                             selected_model = st.session_state.get("selected_model", "gpt-4o")
                             api_key = st.session_state.get("custom_api_key", "") or None
-                            st.session_state.agent = asyncio.run(init_mcp_agent(model=selected_model, api_key=api_key))
+                            get_agent.clear(selected_model, api_key)
+                            st.session_state.agent = get_agent(selected_model, api_key)
                         st.success("✅ Reconnected successfully!")
                     except (MCPConnectionError, LLMInitializationError) as e:
                         st.session_state.agent_error = str(e)
@@ -501,10 +926,10 @@ def streamlit_app() -> None:
                     st.rerun()
             
             # Cache management
-            if "response_cache" in st.session_state and st.session_state.response_cache:
+            if len(get_response_cache()) > 0:
                 if st.button("🧹 Clear Cache", use_container_width=True):
-                    st.session_state.response_cache = {}
-                    st.session_state.cache_timestamps = {}
+                    get_response_cache().clear()
+                    get_semantic_cache.clear()
                     if "cache_hits" in st.session_state:
                         st.session_state.cache_hits = 0
                     st.success("Cache cleared!")
@@ -516,18 +941,7 @@ def streamlit_app() -> None:
         
         # Statistics
         if st.session_state.messages:
-            st.header("📊 Chat Statistics")
-            user_messages = len([m for m in st.session_state.messages if m["role"] == "user"])
-            st.metric("Queries Asked", user_messages)
-            st.metric("Total Messages", len(st.session_state.messages))
-            
-            # Cache statistics
-            if "response_cache" in st.session_state:
-                cache_size = len(st.session_state.response_cache)
-                st.metric("Cached Responses", cache_size)
-                if cache_size > 0:
-                    cache_hit_rate = st.session_state.get("cache_hits", 0) / max(user_messages, 1) * 100
-                    st.metric("Cache Hit Rate", f"{cache_hit_rate:.1f}%")
+            display_chat_statistics()
         
         # About section
         st.header("ℹ️ About")
@@ -559,19 +973,7 @@ def streamlit_app() -> None:
         if "agent" in st.session_state and st.session_state.agent:
             current_model = st.session_state.get("selected_model", "gpt-4o")
             with st.expander(f"🤖 Current Model: {AVAILABLE_MODELS.get(current_model, current_model)}"):
-                model_info = {
-                    "gpt-4o": "Advanced model with excellent reasoning and multimodal capabilities",
-                    "gpt-4o-mini": "Faster, cost-effective version of GPT-4o",
-                    "o3": "Latest reasoning model with enhanced problem-solving capabilities",
-                    "o3-mini": "Efficient version of o3 model",
-                    "gpt-4": "Previous generation flagship model",
-                    "gpt-4-mini": "Lightweight version of GPT-4",
-                    "gpt-5": "Newest generation model with enhanced capabilities",
-                    "gpt-5-mini": "Efficient newest generation model",
-                    "gpt-5-nano": "Ultra-efficient newest generation model"
-                }
-                
-                st.markdown(f"**Description:** {model_info.get(current_model, 'Advanced language model')}")
+                st.markdown(f"**Description:** {MODEL_INFO.get(current_model, 'Advanced language model')}")
                 
                 # Show info for newest models
                 if current_model in ["gpt-5", "gpt-5-mini", "gpt-5-nano"]:
@@ -581,14 +983,7 @@ def streamlit_app() -> None:
         
         # Tips section
         with st.expander("💡 Tips for better results"):
-            st.markdown("""
-            - Be specific in your queries
-            - Ask about genres, actors, directors, or years
-            - Use natural language - no need for SQL!
-            - Try comparative queries like "best rated movies"
-            - Ask for recommendations based on preferences
-            - Different models may provide varying response styles
-            """)
+            st.markdown(TIPS_MD)
         
         # Footer
         st.markdown("---")
@@ -4,48 +4,347 @@ This server exposes CRUD functions as MCP tools using FastMCP
 """
 
 import os, sys
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from os.path import dirname as up
+from pathlib import Path
 
 sys.path.append(os.path.abspath(os.path.join(up(__file__), os.pardir)))
 
 
 from fastmcp import FastMCP
 from typing import Optional, List, Dict, Any
-import sqlite3
-from datetime import datetime
+try:
+    # Bundles a recent SQLite build; fall back to the one Python ships with
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
 import json
+import re
 
-from utilities.constants import DB_FILE_PATH
+from utilities.constants import DB_FILE_PATH, DB_POOL_SIZE
+from utilities.db_setup import (
+    configure_connection,
+    ensure_schema,
+    fts_title_query,
+    optimize_connection,
+    stored_release_date,
+    sync_movie_genres,
+)
 
 # Initialize FastMCP server
 mcp = FastMCP("Movies Database MCP Server")
 
+# Prepared statements kept per pooled connection
+STATEMENT_CACHE_SIZE = 128
+
+# Most rows a listing tool materializes, whatever limit the caller asks for
+MAX_RESULT_ROWS = 500
+
+# YYYY-MM-DD with a plausible month and day, matched against the whole string
+DATE_RE = re.compile(r'\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])')
+
+# Columns returned by listing tools; overview and poster_url are the widest values
+# and are only returned by get_movie_by_id
+LISTING_COLUMNS = (
+    "movies.id, movies.title, movies.release_date, movies.vote_average, movies.vote_count, "
+    "movies.popularity, movies.original_language, movies.genre"
+)
+
+# Sort orders of the listing queries, in output column names so build_json_query
+# can number the rows by them
+POPULARITY_ORDER = "popularity DESC"
+RATING_ORDER = "vote_average DESC, vote_count DESC"
+
+# SQL used by the tools, kept as constants so each statement is prepared once per connection
+CREATE_MOVIE_QUERY = """
+    INSERT INTO movies (title, release_date, overview, popularity, vote_count, 
+                      vote_average, original_language, genre, poster_url)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+GET_MOVIE_BY_ID_QUERY = "SELECT * FROM movies WHERE id = ?"
+
+SEARCH_MOVIES_BY_TITLE_QUERY = f"""
+    SELECT {LISTING_COLUMNS} FROM movies_fts 
+    JOIN movies ON movies.id = movies_fts.rowid 
+    WHERE movies_fts MATCH ? 
+    ORDER BY {POPULARITY_ORDER}
+    LIMIT ?
+    """
+
+# Substring fallback for search terms without any indexable words
+SEARCH_MOVIES_BY_TITLE_LIKE_QUERY = f"""
+    SELECT {LISTING_COLUMNS} FROM movies 
+    WHERE title LIKE ? 
+    ORDER BY {POPULARITY_ORDER}
+    LIMIT ?
+    """
+
+GET_MOVIES_BY_GENRE_QUERY = f"""
+    SELECT {LISTING_COLUMNS} FROM genres 
+    JOIN movie_genres ON movie_genres.genre_id = genres.id 
+    JOIN movies ON movies.id = movie_genres.movie_id 
+    WHERE genres.name = ? 
+    ORDER BY {RATING_ORDER}
+    LIMIT ?
+    """
+
+GENRE_HAS_MOVIES_QUERY = """
+    SELECT EXISTS (
+        SELECT 1 FROM genres 
+        JOIN movie_genres ON movie_genres.genre_id = genres.id 
+        WHERE genres.name = ?
+    )
+    """
+
+# Substring fallback for partial genre names
+GET_MOVIES_BY_GENRE_LIKE_QUERY = f"""
+    SELECT {LISTING_COLUMNS} FROM movies 
+    WHERE genre LIKE ? 
+    ORDER BY {RATING_ORDER}
+    LIMIT ?
+    """
+
+GET_MOVIES_BY_YEAR_QUERY = f"""
+    SELECT {LISTING_COLUMNS} FROM movies 
+    WHERE release_year = ? 
+    ORDER BY {POPULARITY_ORDER}
+    LIMIT ?
+    """
+
+GET_TOP_RATED_MOVIES_QUERY = f"""
+    SELECT {LISTING_COLUMNS} FROM movies 
+    WHERE vote_count >= ? 
+    ORDER BY {RATING_ORDER}
+    LIMIT ?
+    """
+
+# Every right-hand side sees the row's values from before the update. RETURNING
+# hands back whole-number REAL values as integers, so the average is cast back.
+ADD_VOTE_QUERY = """
+    UPDATE movies 
+    SET vote_average = ROUND((vote_average * vote_count + ?) / (vote_count + 1.0), 1),
+        vote_count = vote_count + 1
+    WHERE id = ?
+    RETURNING vote_count, CAST(vote_average AS REAL)
+    """
+
+DELETE_MOVIE_QUERY = "DELETE FROM movies WHERE id = ? RETURNING title"
+
+# Rating statistics only count movies that have votes
+SUMMARY_STATISTICS_QUERY = """
+    SELECT 
+        COUNT(*) as total_movies,
+        MIN(release_date) as first_release,
+        MAX(release_date) as last_release,
+        AVG(CASE WHEN vote_count > 0 THEN vote_average END) as avg_rating,
+        MIN(CASE WHEN vote_count > 0 THEN vote_average END) as min_rating,
+        MAX(CASE WHEN vote_count > 0 THEN vote_average END) as max_rating,
+        AVG(CASE WHEN vote_count > 0 THEN vote_count END) as avg_votes
+    FROM movies
+    """
+
+TOP_GENRES_QUERY = """
+    SELECT genres.name as genre, COUNT(*) as count 
+    FROM movie_genres 
+    JOIN genres ON genres.id = movie_genres.genre_id 
+    GROUP BY movie_genres.genre_id 
+    ORDER BY count DESC 
+    LIMIT 10
+    """
+
+TOP_LANGUAGES_QUERY = """
+    SELECT original_language, COUNT(*) as count 
+    FROM movies 
+    GROUP BY original_language 
+    ORDER BY count DESC 
+    LIMIT 10
+    """
+
+MOVIES_BY_DECADE_QUERY = """
+    SELECT 
+        CAST(release_year / 10 * 10 as TEXT) || 's' as decade,
+        COUNT(*) as count
+    FROM movies 
+    WHERE release_year IS NOT NULL
+    GROUP BY decade
+    ORDER BY decade DESC
+    LIMIT 10
+    """
+
+# Advanced search predicates, in the order they appear in the WHERE clause
+SEARCH_CONDITIONS = {
+    "title": "id IN (SELECT rowid FROM movies_fts WHERE movies_fts MATCH ?)",
+    "title_like": "title LIKE ?",
+    "genre": "genre LIKE ?",
+    "language": "original_language = ?",
+    "min_rating": "vote_average >= ?",
+    "max_rating": "vote_average <= ?",
+    "year_from": "release_year >= ?",
+    "year_to": "release_year <= ?",
+}
+
 
 # Helper functions
-def get_connection():
-    """Get database connection"""
-    return sqlite3.connect(DB_FILE_PATH)
+def get_connection(read_only: bool = False):
+    """Open a long-lived database connection; read-only ones cannot modify the file"""
+    if read_only:
+        database, uri = Path(DB_FILE_PATH).resolve().as_uri() + "?mode=ro", True
+    else:
+        database, uri = DB_FILE_PATH, False
+    conn = sqlite3.connect(
+        database,
+        uri=uri,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    return configure_connection(conn)
 
-def execute_query(query: str, params: tuple = (), fetch_one: bool = False):
-    """Execute a query and return results"""
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
+# One writer, serialized by a lock; WAL lets the pooled readers run alongside it
+_writer = get_connection()
+_write_lock = threading.Lock()
+
+# Upgrade databases created before the full-text index and genre tables existed
+ensure_schema(_writer)
+
+_readers = queue.Queue(maxsize=DB_POOL_SIZE)
+for _ in range(DB_POOL_SIZE):
+    _readers.put(get_connection(read_only=True))
+
+@contextmanager
+def _acquire(read_only: bool = True):
+    """Check out a reader from the pool, or hold the writer, for the duration of a block"""
+    if not read_only:
+        with _write_lock:
+            yield _writer
+        return
+    conn = _readers.get()
     try:
+        yield conn
+    finally:
+        _readers.put(conn)
+
+@contextmanager
+def _transaction():
+    """Run a block of statements on the writer as one transaction"""
+    with _acquire(read_only=False) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+@atexit.register
+def close_pool():
+    """Close all connections on shutdown"""
+    while True:
+        try:
+            conn = _readers.get_nowait()
+        except queue.Empty:
+            break
+        conn.close()
+    
+    with _write_lock:
+        optimize_connection(_writer)
+        _writer.close()
+
+def query_movies(query: str, params: tuple = ()) -> Dict[str, Any]:
+    """Run a movie listing query and return its rows as positional lists plus one list of columns"""
+    with _acquire() as conn:
+        cursor = conn.execute(query, params)
+        # SQLite produces rows lazily, so rows past the cap are never read
+        rows = cursor.fetchmany(MAX_RESULT_ROWS + 1)
+        columns = [column[0] for column in cursor.description]
+        cursor.close()
+    
+    result = {
+        "success": True,
+        "columns": columns,
+        "rows": rows[:MAX_RESULT_ROWS],
+        "count": min(len(rows), MAX_RESULT_ROWS)
+    }
+    if len(rows) > MAX_RESULT_ROWS:
+        result["truncated"] = True
+    return result
+
+@lru_cache(maxsize=64)
+def build_json_query(query: str, columns: tuple, order_by: str) -> str:
+    """Wrap a listing query so SQLite returns the whole capped result, in order_by order, as one JSON document"""
+    names = ", ".join("'" + column.replace("'", "''") + "'" for column in columns)
+    values = ", ".join('"' + column.replace('"', '""') + '"' for column in columns)
+    return f"""
+        SELECT json_object(
+            'success', json('true'),
+            'columns', json_array({names}),
+            'rows', json_group_array(json_array({values})) FILTER (WHERE row_number <= {MAX_RESULT_ROWS}),
+            'count', min(count(*), {MAX_RESULT_ROWS}),
+            'truncated', json(iif(count(*) > {MAX_RESULT_ROWS}, 'true', 'false'))
+        )
+        FROM (
+            SELECT *, row_number() OVER (ORDER BY {order_by}) AS row_number
+            FROM ({query})
+            ORDER BY row_number
+            LIMIT {MAX_RESULT_ROWS + 1}
+        )
+        """
+
+@lru_cache(maxsize=64)
+def listing_columns(query: str, param_count: int) -> tuple:
+    """Learn the column names a listing query returns, once per query"""
+    with _acquire() as conn:
+        # LIMIT 0 only prepares the query, so placeholder values are enough
+        cursor = conn.execute(f"SELECT * FROM ({query}) LIMIT 0", (None,) * param_count)
+        columns = tuple(column[0] for column in cursor.description)
+        cursor.close()
+    return columns
+
+def query_movies_json(query: str, params: tuple, order_by: str) -> str:
+    """Run a movie listing query sorted by order_by and return the same shape as query_movies, serialized by SQLite"""
+    json_query = build_json_query(query, listing_columns(query, len(params)), order_by)
+    with _acquire() as conn:
+        return conn.execute(json_query, params).fetchone()[0]
+
+def execute_query(query: str, params: tuple = (), fetch_one: bool = False):
+    """Execute a query and return results; only plain SELECTs go to a reader"""
+    with _acquire(read_only=query.lstrip().upper().startswith('SELECT')) as conn:
+        cursor = conn.cursor()
         cursor.execute(query, params)
         
-        if query.strip().upper().startswith('SELECT'):
+        # SELECT and RETURNING statements produce rows; read them all so the statement completes
+        if cursor.description is not None:
+            result = cursor.fetchall()
             if fetch_one:
-                result = cursor.fetchone()
-            else:
-                result = cursor.fetchall()
+                return result[0] if result else None
             return result
         else:
-            conn.commit()
+            # Connections run in autocommit mode, so the change is already committed
             return cursor.lastrowid if query.strip().upper().startswith('INSERT') else cursor.rowcount
-    finally:
-        conn.close()
+
+@lru_cache(maxsize=256)
+def build_search_query(filters: tuple) -> str:
+    """Build the advanced search SQL for a combination of active filters"""
+    conditions = [SEARCH_CONDITIONS[name] for name in filters]
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    
+    return f"""
+    SELECT {LISTING_COLUMNS} FROM movies 
+    WHERE {where_clause}
+    ORDER BY {POPULARITY_ORDER}
+    LIMIT ?
+    """
+
+@lru_cache(maxsize=256)
+def build_update_query(columns: tuple) -> str:
+    """Build the UPDATE SQL for a combination of changed columns"""
+    set_clause = ", ".join([f"{col} = ?" for col in columns])
+    return f"UPDATE movies SET {set_clause} WHERE id = ?"
 
 # CREATE Tools
 @mcp.tool()
@@ -82,27 +381,20 @@ def create_movie(
         return {"success": False, "error": "Title is required"}
     
     # Validate date format if provided
-    if release_date:
-        try:
-            datetime.strptime(release_date, '%Y-%m-%d')
-        except ValueError:
-            return {"success": False, "error": "Release date must be in YYYY-MM-DD format"}
+    if release_date and not DATE_RE.fullmatch(release_date):
+        return {"success": False, "error": "Release date must be in YYYY-MM-DD format"}
     
     # Validate vote average range
     if not 0 <= vote_average <= 10:
         return {"success": False, "error": "Vote average must be between 0 and 10"}
     
-    query = """
-    INSERT INTO movies (title, release_date, overview, popularity, vote_count, 
-                      vote_average, original_language, genre, poster_url)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
-    
-    params = (title, release_date, overview, popularity, vote_count, 
+    params = (title, stored_release_date(release_date), overview, popularity, vote_count, 
              vote_average, original_language, genre, poster_url)
     
     try:
-        movie_id = execute_query(query, params)
+        with _transaction() as conn:
+            movie_id = conn.execute(CREATE_MOVIE_QUERY, params).lastrowid
+            sync_movie_genres(conn, movie_id, genre)
         return {
             "success": True, 
             "movie_id": movie_id,
@@ -123,44 +415,36 @@ def get_movie_by_id(movie_id: int) -> Dict[str, Any]:
     Returns:
         Movie data or error message
     """
-    query = "SELECT * FROM movies WHERE id = ?"
-    result = execute_query(query, (movie_id,), fetch_one=True)
+    result = query_movies(GET_MOVIE_BY_ID_QUERY, (movie_id,))
     
-    if result:
+    if result["rows"]:
         return {
             "success": True,
-            "movie": dict(result)
+            "movie": dict(zip(result["columns"], result["rows"][0]))
         }
     return {"success": False, "error": f"Movie with ID {movie_id} not found"}
 
-@mcp.tool()
-def search_movies_by_title(title_search: str, limit: int = 20) -> Dict[str, Any]:
+# Listing tools return JSON already serialized by SQLite; without an output schema
+# it is sent once, as text content, instead of again as wrapped structured content
+@mcp.tool(output_schema=None)
+def search_movies_by_title(title_search: str, limit: int = 20) -> str:
     """
-    Search movies by title (partial match)
+    Search movies by title (matches titles containing words that start with each search word)
     
     Args:
         title_search: Search term for movie titles
         limit: Maximum number of results to return
         
     Returns:
-        List of matching movies
+        List of matching movies as column names plus one row of values per movie
     """
-    query = """
-    SELECT * FROM movies 
-    WHERE title LIKE ? 
-    ORDER BY popularity DESC
-    LIMIT ?
-    """
-    results = execute_query(query, (f'%{title_search}%', limit))
-    
-    return {
-        "success": True,
-        "movies": [dict(row) for row in results],
-        "count": len(results)
-    }
+    match_query = fts_title_query(title_search)
+    if match_query:
+        return query_movies_json(SEARCH_MOVIES_BY_TITLE_QUERY, (match_query, limit), POPULARITY_ORDER)
+    return query_movies_json(SEARCH_MOVIES_BY_TITLE_LIKE_QUERY, (f'%{title_search}%', limit), POPULARITY_ORDER)
 
-@mcp.tool()
-def get_movies_by_genre(genre: str, limit: int = 50) -> Dict[str, Any]:
+@mcp.tool(output_schema=None)
+def get_movies_by_genre(genre: str, limit: int = 50) -> str:
     """
     Get movies by genre
     
@@ -169,24 +453,14 @@ def get_movies_by_genre(genre: str, limit: int = 50) -> Dict[str, Any]:
         limit: Maximum number of results
         
     Returns:
-        List of movies in the specified genre
-    """
-    query = """
-    SELECT * FROM movies 
-    WHERE genre LIKE ? 
-    ORDER BY vote_average DESC, vote_count DESC
-    LIMIT ?
+        List of movies in the specified genre as column names plus one row of values per movie
     """
-    results = execute_query(query, (f'%{genre}%', limit))
-    
-    return {
-        "success": True,
-        "movies": [dict(row) for row in results],
-        "count": len(results)
-    }
+    if execute_query(GENRE_HAS_MOVIES_QUERY, (genre.strip(),), fetch_one=True)[0]:
+        return query_movies_json(GET_MOVIES_BY_GENRE_QUERY, (genre.strip(), limit), RATING_ORDER)
+    return query_movies_json(GET_MOVIES_BY_GENRE_LIKE_QUERY, (f'%{genre}%', limit), RATING_ORDER)
 
-@mcp.tool()
-def get_movies_by_year(year: int, limit: int = 100) -> Dict[str, Any]:
+@mcp.tool(output_schema=None)
+def get_movies_by_year(year: int, limit: int = 100) -> str:
     """
     Get movies released in a specific year
     
@@ -195,24 +469,12 @@ def get_movies_by_year(year: int, limit: int = 100) -> Dict[str, Any]:
         limit: Maximum number of results
         
     Returns:
-        List of movies from the specified year
+        List of movies from the specified year as column names plus one row of values per movie
     """
-    query = """
-    SELECT * FROM movies 
-    WHERE strftime('%Y', release_date) = ? 
-    ORDER BY popularity DESC
-    LIMIT ?
-    """
-    results = execute_query(query, (str(year), limit))
-    
-    return {
-        "success": True,
-        "movies": [dict(row) for row in results],
-        "count": len(results)
-    }
+    return query_movies_json(GET_MOVIES_BY_YEAR_QUERY, (int(year), limit), POPULARITY_ORDER)
 
-@mcp.tool()
-def get_top_rated_movies(min_votes: int = 100, limit: int = 50) -> Dict[str, Any]:
+@mcp.tool(output_schema=None)
+def get_top_rated_movies(min_votes: int = 100, limit: int = 50) -> str:
     """
     Get top-rated movies with minimum vote threshold
     
@@ -221,23 +483,11 @@ def get_top_rated_movies(min_votes: int = 100, limit: int = 50) -> Dict[str, Any
         limit: Maximum number of results
         
     Returns:
-        List of top-rated movies
+        List of top-rated movies as column names plus one row of values per movie
     """
-    query = """
-    SELECT * FROM movies 
-    WHERE vote_count >= ? 
-    ORDER BY vote_average DESC, vote_count DESC
-    LIMIT ?
-    """
-    results = execute_query(query, (min_votes, limit))
-    
-    return {
-        "success": True,
-        "movies": [dict(row) for row in results],
-        "count": len(results)
-    }
+    return query_movies_json(GET_TOP_RATED_MOVIES_QUERY, (min_votes, limit), RATING_ORDER)
 
-@mcp.tool()
+@mcp.tool(output_schema=None)
 def advanced_search_movies(
     title: Optional[str] = None,
     genre: Optional[str] = None,
@@ -247,7 +497,7 @@ def advanced_search_movies(
     year_from: Optional[int] = None,
     year_to: Optional[int] = None,
     limit: int = 100
-) -> Dict[str, Any]:
+) -> str:
     """
     Advanced movie search with multiple filters
     
@@ -262,56 +512,48 @@ def advanced_search_movies(
         limit: Maximum number of results
         
     Returns:
-        List of movies matching the criteria
+        List of movies matching the criteria as column names plus one row of values per movie
     """
-    conditions = []
+    filters = []
     params = []
     
     if title:
-        conditions.append("title LIKE ?")
-        params.append(f'%{title}%')
+        match_query = fts_title_query(title)
+        if match_query:
+            filters.append("title")
+            params.append(match_query)
+        else:
+            filters.append("title_like")
+            params.append(f'%{title}%')
     
     if genre:
-        conditions.append("genre LIKE ?")
+        filters.append("genre")
         params.append(f'%{genre}%')
     
     if language:
-        conditions.append("original_language = ?")
+        filters.append("language")
         params.append(language)
     
     if min_rating is not None:
-        conditions.append("vote_average >= ?")
+        filters.append("min_rating")
         params.append(min_rating)
     
     if max_rating is not None:
-        conditions.append("vote_average <= ?")
+        filters.append("max_rating")
         params.append(max_rating)
     
     if year_from:
-        conditions.append("strftime('%Y', release_date) >= ?")
-        params.append(str(year_from))
+        filters.append("year_from")
+        params.append(int(year_from))
     
     if year_to:
-        conditions.append("strftime('%Y', release_date) <= ?")
-        params.append(str(year_to))
+        filters.append("year_to")
+        params.append(int(year_to))
     
-    where_clause = " AND ".join(conditions) if conditions else "1=1"
-    
-    query = f"""
-    SELECT * FROM movies 
-    WHERE {where_clause}
-    ORDER BY popularity DESC
-    LIMIT ?
-    """
+    query = build_search_query(tuple(filters))
     params.append(limit)
     
-    results = execute_query(query, tuple(params))
-    
-    return {
-        "success": True,
-        "movies": [dict(row) for row in results],
-        "count": len(results)
-    }
+    return query_movies_json(query, tuple(params), POPULARITY_ORDER)
 
 # UPDATE Tools
 @mcp.tool()
@@ -350,7 +592,9 @@ def update_movie(
     if title is not None:
         updates['title'] = title
     if release_date is not None:
-        updates['release_date'] = release_date
+        if release_date and not DATE_RE.fullmatch(release_date):
+            return {"success": False, "error": "Release date must be in YYYY-MM-DD format"}
+        updates['release_date'] = stored_release_date(release_date)
     if overview is not None:
         updates['overview'] = overview
     if popularity is not None:
@@ -372,13 +616,15 @@ def update_movie(
         return {"success": False, "error": "No fields to update"}
     
     # Build update query
-    set_clause = ", ".join([f"{col} = ?" for col in updates.keys()])
-    query = f"UPDATE movies SET {set_clause} WHERE id = ?"
+    query = build_update_query(tuple(updates.keys()))
     
     params = list(updates.values()) + [movie_id]
     
     try:
-        rows_affected = execute_query(query, tuple(params))
+        with _transaction() as conn:
+            rows_affected = conn.execute(query, tuple(params)).rowcount
+            if rows_affected > 0 and 'genre' in updates:
+                sync_movie_genres(conn, movie_id, updates['genre'])
         
         if rows_affected > 0:
             return {
@@ -408,34 +654,19 @@ def add_movie_vote(movie_id: int, rating: float) -> Dict[str, Any]:
     if not 0 <= rating <= 10:
         return {"success": False, "error": "Rating must be between 0 and 10"}
     
-    # Get current movie data
-    query = "SELECT vote_count, vote_average FROM movies WHERE id = ?"
-    result = execute_query(query, (movie_id,), fetch_one=True)
+    # Update the count and average in one atomic statement
+    result = execute_query(ADD_VOTE_QUERY, (rating, movie_id), fetch_one=True)
     
     if not result:
         return {"success": False, "error": f"Movie ID {movie_id} not found"}
     
-    # Calculate new average
-    current_count = result['vote_count']
-    current_avg = result['vote_average']
-    
-    new_count = current_count + 1
-    new_avg = ((current_avg * current_count) + rating) / new_count
-    new_avg = round(new_avg, 1)
-    
-    # Update movie
-    update_query = "UPDATE movies SET vote_count = ?, vote_average = ? WHERE id = ?"
-    rows_affected = execute_query(update_query, (new_count, new_avg, movie_id))
-    
-    if rows_affected > 0:
-        return {
-            "success": True,
-            "message": f"Vote added successfully",
-            "new_average": new_avg,
-            "total_votes": new_count
-        }
-    else:
-        return {"success": False, "error": "Failed to update movie"}
+    new_count, new_avg = result
+    return {
+        "success": True,
+        "message": f"Vote added successfully",
+        "new_average": new_avg,
+        "total_votes": new_count
+    }
 
 # DELETE Tools
 @mcp.tool()
@@ -449,26 +680,17 @@ def delete_movie(movie_id: int) -> Dict[str, Any]:
     Returns:
         Success status and message
     """
-    # Check if movie exists first
-    check_query = "SELECT title FROM movies WHERE id = ?"
-    result = execute_query(check_query, (movie_id,), fetch_one=True)
+    # Delete the movie, getting its title back for the message
+    result = execute_query(DELETE_MOVIE_QUERY, (movie_id,), fetch_one=True)
     
     if not result:
         return {"success": False, "error": f"Movie ID {movie_id} not found"}
     
-    title = result['title']
-    
-    # Delete the movie
-    delete_query = "DELETE FROM movies WHERE id = ?"
-    rows_affected = execute_query(delete_query, (movie_id,))
-    
-    if rows_affected > 0:
-        return {
-            "success": True,
-            "message": f"Movie '{title}' (ID: {movie_id}) deleted successfully"
-        }
-    else:
-        return {"success": False, "error": "Failed to delete movie"}
+    title = result[0]
+    return {
+        "success": True,
+        "message": f"Movie '{title}' (ID: {movie_id}) deleted successfully"
+    }
 
 # Statistics Tool
 @mcp.tool()
@@ -479,72 +701,35 @@ def get_database_statistics() -> Dict[str, Any]:
     Returns:
         Database statistics including counts, averages, and distributions
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     stats = {}
     
     try:
-        # Total movies
-        cursor.execute("SELECT COUNT(*) FROM movies")
-        stats['total_movies'] = cursor.fetchone()[0]
-        
-        # Date range
-        cursor.execute("SELECT MIN(release_date), MAX(release_date) FROM movies WHERE release_date IS NOT NULL")
-        min_date, max_date = cursor.fetchone()
-        stats['date_range'] = {'from': min_date, 'to': max_date}
-        
-        # Rating statistics
-        cursor.execute("""
-            SELECT 
-                AVG(vote_average) as avg_rating,
-                MIN(vote_average) as min_rating,
-                MAX(vote_average) as max_rating,
-                AVG(vote_count) as avg_votes
-            FROM movies 
-            WHERE vote_count > 0
-        """)
-        result = cursor.fetchone()
-        stats['rating_stats'] = {
-            'average_rating': round(result[0], 2) if result[0] else 0,
-            'min_rating': result[1] or 0,
-            'max_rating': result[2] or 0,
-            'average_votes': round(result[3], 0) if result[3] else 0
-        }
-        
-        # Most common genres
-        cursor.execute("""
-            SELECT genre, COUNT(*) as count 
-            FROM movies 
-            WHERE genre != ''
-            GROUP BY genre 
-            ORDER BY count DESC 
-            LIMIT 10
-        """)
-        stats['top_genres'] = [{'genre': row[0], 'count': row[1]} for row in cursor.fetchall()]
-        
-        # Language distribution
-        cursor.execute("""
-            SELECT original_language, COUNT(*) as count 
-            FROM movies 
-            GROUP BY original_language 
-            ORDER BY count DESC 
-            LIMIT 10
-        """)
-        stats['top_languages'] = [{'language': row[0], 'count': row[1]} for row in cursor.fetchall()]
-        
-        # Movies by decade
-        cursor.execute("""
-            SELECT 
-                CAST(strftime('%Y', release_date) / 10 * 10 as TEXT) || 's' as decade,
-                COUNT(*) as count
-            FROM movies 
-            WHERE release_date IS NOT NULL
-            GROUP BY decade
-            ORDER BY decade DESC
-            LIMIT 10
-        """)
-        stats['movies_by_decade'] = [{'decade': row[0], 'count': row[1]} for row in cursor.fetchall()]
+        with _acquire() as conn:
+            cursor = conn.cursor()
+            
+            # Totals, date range and rating statistics in one pass
+            cursor.execute(SUMMARY_STATISTICS_QUERY)
+            result = cursor.fetchone()
+            stats['total_movies'] = result[0]
+            stats['date_range'] = {'from': result[1], 'to': result[2]}
+            stats['rating_stats'] = {
+                'average_rating': round(result[3], 2) if result[3] else 0,
+                'min_rating': result[4] or 0,
+                'max_rating': result[5] or 0,
+                'average_votes': round(result[6], 0) if result[6] else 0
+            }
+            
+            # Most common genres
+            cursor.execute(TOP_GENRES_QUERY)
+            stats['top_genres'] = [{'genre': row[0], 'count': row[1]} for row in cursor.fetchall()]
+            
+            # Language distribution
+            cursor.execute(TOP_LANGUAGES_QUERY)
+            stats['top_languages'] = [{'language': row[0], 'count': row[1]} for row in cursor.fetchall()]
+            
+            # Movies by decade
+            cursor.execute(MOVIES_BY_DECADE_QUERY)
+            stats['movies_by_decade'] = [{'decade': row[0], 'count': row[1]} for row in cursor.fetchall()]
         
         return {
             "success": True,
@@ -553,8 +738,6 @@ def get_database_statistics() -> Dict[str, Any]:
         
     except Exception as e:
         return {"success": False, "error": str(e)}
-    finally:
-        conn.close()
 
 # Main entry point
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+import contextlib
+import io
+import os
+from unittest import mock
+
+from utilities import ingest_movies_to_sqlite
+
+MOVIES_CSV = """Release_Date,Title,Overview,Popularity,Vote_Count,Vote_Average,Original_Language,Genre,Poster_Url
+2021-12-15,Spider-Man: No Way Home,Peter Parker is unmasked.,5083.954,8940,8.3,en,"Action, Adventure",https://example.com/a.jpg
+2022-03-01,The Batman,Batman uncovers corruption.,3827.658,1151,8.1,en,"Crime, Mystery",https://example.com/b.jpg
+"""
+
+
+def create_movies_database(directory: str) -> str:
+    """Ingest MOVIES_CSV into a new database in a directory the way the ingest script does, and return its path"""
+    csv_path = os.path.join(directory, "movies.csv")
+    db_path = os.path.join(directory, "movies.db")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(MOVIES_CSV)
+    
+    with mock.patch.multiple(ingest_movies_to_sqlite, CSV_FILE_PATH=csv_path, DB_FILE_PATH=db_path), \
+            contextlib.redirect_stdout(io.StringIO()):
+        ingest_movies_to_sqlite.ingest_csv_to_sqlite()
+    return db_path
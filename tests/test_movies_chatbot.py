@@ -0,0 +1,33 @@
+import os, sys
+import unittest
+from os.path import dirname as up
+
+sys.path.append(os.path.abspath(os.path.join(up(__file__), os.pardir)))
+
+from client.movies_chatbot import FOLLOW_UP_CATEGORY_RE
+
+
+def category(query):
+    """Return the follow-up category detected in a query, or None"""
+    match = FOLLOW_UP_CATEGORY_RE.search(query)
+    return match.lastgroup if match else None
+
+
+class FollowUpCategoryTest(unittest.TestCase):
+    def test_matches_whole_words(self):
+        self.assertEqual(category("Show me Tom Hanks movies"), "actor")
+        self.assertEqual(category("Who are the best directors?"), "director")
+        self.assertEqual(category("Top movies of 2022"), "year")
+    
+    def test_ignores_words_that_only_start_with_a_keyword(self):
+        self.assertIsNone(category("What is playing tomorrow?"))
+        self.assertIsNone(category("Tell me about Tomb Raider"))
+        self.assertIsNone(category("Best movies from 20215"))
+    
+    def test_sci_fi_with_or_without_hyphen(self):
+        self.assertEqual(category("Highest rated sci-fi movies"), "genre")
+        self.assertEqual(category("Highest rated scifi movies"), "genre")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os, sys
+import tempfile
+import unittest
+from os.path import dirname as up
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(up(__file__), os.pardir)))
+
+from tests.database import create_movies_database
+from utilities import movies_crud
+from utilities.movies_crud import MoviesCRUD
+
+
+class MoviesCRUDTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_path = create_movies_database(directory.name)
+        
+        self.crud = MoviesCRUD(self.db_path)
+        self.addCleanup(self.crud.close)
+    
+    def test_upsert_updates_ingested_movie(self):
+        count = self.crud.create_movies_bulk([{
+            'title': "Spider-Man: No Way Home",
+            'release_date': "2021-12-15",
+            'popularity': 6000.0,
+            'vote_count': 9000,
+            'vote_average': 8.4,
+        }])
+        
+        self.assertEqual(count, 1)
+        movies = self.crud.get_movies_by_title("Spider-Man")
+        self.assertEqual(len(movies), 1)
+        self.assertEqual(movies[0]['vote_count'], 9000)
+        self.assertEqual(movies[0]['vote_average'], 8.4)
+        self.assertEqual(movies[0]['release_date'], "2021-12-15 00:00:00")
+        self.assertEqual(self.crud.get_statistics()['total_movies'], 2)
+    
+    def test_iteration_reads_one_snapshot(self):
+        with mock.patch.object(movies_crud, "ITER_BATCH_SIZE", 1):
+            movies = self.crud.iter_search_movies()
+            first = next(movies)
+            # A rolled back transaction and a committed write while the cursor is open
+            with self.assertRaises(RuntimeError), self.crud.transaction() as conn:
+                conn.execute("UPDATE movies SET title = 'Renamed'")
+                raise RuntimeError("abandon the transaction")
+            for movie in self.crud.search_movies():
+                self.crud.delete_movie(movie['id'])
+            rest = list(movies)
+        
+        self.assertEqual(first['title'], "Spider-Man: No Way Home")
+        self.assertEqual([movie['title'] for movie in rest], ["The Batman"])
+        self.assertEqual(self.crud.search_movies(), [])
+    
+    def test_cache_sees_writes_from_other_connections(self):
+        movie_id = self.crud.get_movies_by_title("Batman")[0]['id']
+        self.assertEqual(self.crud.get_movie_by_id(movie_id)['vote_count'], 1151)
+        
+        # A second instance has its own connection, like the MCP server process
+        other = MoviesCRUD(self.db_path)
+        self.addCleanup(other.close)
+        other.update_movie(movie_id, vote_count=1200)
+        
+        self.assertEqual(self.crud.get_movie_by_id(movie_id)['vote_count'], 1200)
+        other.delete_movie(movie_id)
+        self.assertIsNone(self.crud.get_movie_by_id(movie_id))
+        self.assertEqual(self.crud.get_statistics()['total_movies'], 1)
+    
+    def test_check_constraint_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.crud.create_movie("Out of Range", release_date="2023-01-01", vote_average=11)
+
+
+if __name__ == "__main__":
+    unittest.main()
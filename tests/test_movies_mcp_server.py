@@ -0,0 +1,46 @@
+import os, sys
+import asyncio
+import importlib
+import json
+import tempfile
+import unittest
+from os.path import dirname as up
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(up(__file__), os.pardir)))
+
+from fastmcp import Client
+
+from tests.database import create_movies_database
+
+
+class ListingToolsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        db_path = create_movies_database(directory.name)
+        
+        # The server opens its connections on import, so import it against the test database
+        sys.modules.pop("server.movies_mcp_server", None)
+        with mock.patch("utilities.constants.DB_FILE_PATH", db_path):
+            cls.server = importlib.import_module("server.movies_mcp_server")
+    
+    def call_tool(self, name, arguments):
+        async def call():
+            async with Client(self.server.mcp) as client:
+                return await client.call_tool_mcp(name, arguments)
+        return asyncio.run(call())
+    
+    def test_listing_is_sent_once_as_text(self):
+        result = self.call_tool("get_movies_by_year", {"year": 2021})
+        
+        self.assertIsNone(result.structuredContent)
+        self.assertEqual([content.type for content in result.content], ["text"])
+        listing = json.loads(result.content[0].text)
+        self.assertEqual(listing["count"], 1)
+        self.assertEqual(listing["rows"][0][listing["columns"].index("title")], "Spider-Man: No Way Home")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,8 +12,10 @@ CSV_FILE_PATH = os.getenv("CSV_FILE_PATH")
 
 # Server constants
 DB_FILE_PATH = os.getenv("DB_FILE_PATH")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
 
 # Client constants
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MCP_CONFIG_FILE_PATH = os.getenv("MCP_CONFIG_FILE_PATH")
-MODEL_NAME = os.getenv("MODEL_NAME")
\ No newline at end of file
+MODEL_NAME = os.getenv("MODEL_NAME")
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR")
\ No newline at end of file
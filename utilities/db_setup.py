@@ -0,0 +1,260 @@
+import re
+try:
+    # Bundles a recent SQLite build; fall back to the one Python ships with
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+from typing import List, Optional
+
+
+# Per-connection settings: WAL lets readers run alongside a writer, and the
+# larger page cache, memory-mapped I/O and in-memory temp storage cut disk reads
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-65536",  # 64 MB
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Release year derived from release_date, so year filters can use an index
+RELEASE_YEAR_EXPRESSION = "CAST(strftime('%Y', release_date) AS INTEGER)"
+
+# The ingest stores release dates with a midnight time; bare YYYY-MM-DD dates are
+# stored the same way so the (title, release_date) key matches across writers
+BARE_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+RELEASE_TIME_SUFFIX = " 00:00:00"
+
+# Value rules for movies rows, by constraint name; {row} is empty in CHECK
+# constraints and "new." in the triggers that enforce them on older tables
+MOVIE_CHECKS = {
+    "vote_average_range": "{row}vote_average BETWEEN 0 AND 10",
+    "vote_count_nonnegative": "{row}vote_count >= 0",
+    "language_code_length": "length({row}original_language) <= 8",
+}
+
+# B-tree indexes on movies, built after bulk loads rather than maintained row by row
+MOVIE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_title ON movies(title)",
+    "CREATE INDEX IF NOT EXISTS idx_release_date ON movies(release_date)",
+    "CREATE INDEX IF NOT EXISTS idx_popularity ON movies(popularity)",
+    "CREATE INDEX IF NOT EXISTS idx_release_year ON movies(release_year)",
+    "CREATE INDEX IF NOT EXISTS idx_original_language ON movies(original_language)",
+    # Holds every listing column in top-rated order, so top-rated queries walk it
+    # backwards and stop at the limit without sorting or reading the table rows
+    """
+    CREATE INDEX IF NOT EXISTS idx_top_rated_cover ON movies(
+        vote_average, vote_count, id, title, release_date, popularity, original_language, genre
+    )
+    """,
+)
+
+# Indexes replaced by wider ones above
+OBSOLETE_INDEXES = (
+    "DROP INDEX IF EXISTS idx_vote_average",
+    "DROP INDEX IF EXISTS idx_votes_rating",
+)
+
+# One row per title and release date; lets bulk loads upsert instead of duplicating
+UNIQUE_MOVIE_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_movies_title_date ON movies(title, release_date)"
+)
+
+# Full-text index over titles and overviews, kept in sync with movies by triggers
+FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title,
+        overview,
+        content='movies',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts(rowid, title, overview)
+        VALUES (new.id, new.title, new.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview)
+        VALUES ('delete', old.id, old.title, old.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title, overview ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview)
+        VALUES ('delete', old.id, old.title, old.overview);
+        INSERT INTO movies_fts(rowid, title, overview)
+        VALUES (new.id, new.title, new.overview);
+    END
+    """,
+)
+
+# Normalized genres; movie_genres rows follow their movie on delete
+GENRE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS genres (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE COLLATE NOCASE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS movie_genres (
+        movie_id INTEGER NOT NULL REFERENCES movies(id) ON DELETE CASCADE,
+        genre_id INTEGER NOT NULL REFERENCES genres(id),
+        PRIMARY KEY (movie_id, genre_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_mg_genre ON movie_genres(genre_id, movie_id)",
+)
+
+INSERT_GENRE_QUERY = "INSERT OR IGNORE INTO genres (name) VALUES (?)"
+INSERT_MOVIE_GENRE_QUERY = """
+    INSERT OR IGNORE INTO movie_genres (movie_id, genre_id)
+    SELECT ?, id FROM genres WHERE name = ?
+    """
+
+# Words as split by the unicode61 tokenizer
+FTS_TOKEN_RE = re.compile(r"\w+")
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the performance PRAGMAs to a new connection"""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def optimize_connection(conn: sqlite3.Connection) -> None:
+    """Let SQLite refresh query planner statistics before a connection is closed"""
+    conn.execute("PRAGMA optimize")
+
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    """Check whether a table (or virtual table) exists"""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+def split_genres(genre: str) -> List[str]:
+    """Split a comma-separated genre string into distinct genre names"""
+    names = []
+    seen = set()
+    for name in (genre or "").split(","):
+        name = name.strip()
+        if name and name.casefold() not in seen:
+            seen.add(name.casefold())
+            names.append(name)
+    return names
+
+def stored_release_date(release_date: Optional[str]) -> Optional[str]:
+    """Convert a YYYY-MM-DD release date to the 'YYYY-MM-DD 00:00:00' form the ingest stores"""
+    if release_date and BARE_DATE_RE.fullmatch(release_date):
+        return release_date + RELEASE_TIME_SUFFIX
+    return release_date
+
+def sync_movie_genres(conn: sqlite3.Connection, movie_id: int, genre: str) -> None:
+    """Replace a movie's movie_genres rows with the genres in its genre string"""
+    names = split_genres(genre)
+    conn.execute("DELETE FROM movie_genres WHERE movie_id = ?", (movie_id,))
+    conn.executemany(INSERT_GENRE_QUERY, [(name,) for name in names])
+    conn.executemany(INSERT_MOVIE_GENRE_QUERY, [(movie_id, name) for name in names])
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    """Create any missing indexes on the movies table and drop superseded ones"""
+    for statement in OBSOLETE_INDEXES + MOVIE_INDEXES:
+        conn.execute(statement)
+
+def column_exists(conn: sqlite3.Connection, table: str, name: str) -> bool:
+    """Check whether a table has a column, including generated columns"""
+    return any(row[1] == name for row in conn.execute(f"PRAGMA table_xinfo({table})"))
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Add any missing derived tables to an existing movies database; safe to run repeatedly"""
+    conn.execute("SAVEPOINT ensure_schema")
+    try:
+        if not column_exists(conn, "movies", "release_year"):
+            # ALTER TABLE can only add VIRTUAL generated columns; new databases store it
+            conn.execute(
+                "ALTER TABLE movies ADD COLUMN release_year INTEGER "
+                f"GENERATED ALWAYS AS ({RELEASE_YEAR_EXPRESSION}) VIRTUAL"
+            )
+        create_indexes(conn)
+        if not has_check_constraints(conn):
+            # ALTER TABLE cannot add CHECK constraints, so older tables get triggers
+            create_check_triggers(conn)
+        try:
+            conn.execute(UNIQUE_MOVIE_INDEX)
+        except conn.IntegrityError:
+            # The table already holds duplicates; leave them and skip the constraint.
+            # The connection's own exception class is used, since the caller may have
+            # opened it with a different SQLite driver than the one imported here
+            pass
+        
+        if not table_exists(conn, "movies_fts"):
+            for statement in FTS_SCHEMA:
+                conn.execute(statement)
+            # Index the rows that were loaded before the triggers existed
+            conn.execute("INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')")
+        
+        if not table_exists(conn, "movie_genres"):
+            for statement in GENRE_SCHEMA:
+                conn.execute(statement)
+            # Split the genre strings of the rows that are already loaded
+            pairs = [
+                (movie_id, name)
+                for movie_id, genre in conn.execute("SELECT id, genre FROM movies")
+                for name in split_genres(genre)
+            ]
+            conn.executemany(INSERT_GENRE_QUERY, sorted({(name,) for _, name in pairs}))
+            conn.executemany(INSERT_MOVIE_GENRE_QUERY, pairs)
+        
+        conn.execute("RELEASE ensure_schema")
+    except Exception:
+        conn.execute("ROLLBACK TO ensure_schema")
+        conn.execute("RELEASE ensure_schema")
+        raise
+
+def movie_check_constraints() -> str:
+    """Render MOVIE_CHECKS as named CHECK constraints for a CREATE TABLE statement"""
+    return ",\n".join(
+        f"CONSTRAINT {name} CHECK ({expression.format(row='')})"
+        for name, expression in MOVIE_CHECKS.items()
+    )
+
+def create_check_triggers(conn: sqlite3.Connection) -> None:
+    """Enforce MOVIE_CHECKS with triggers on a movies table created without them"""
+    # RAISE reports the constraint name, the same text a failed CHECK includes
+    body = "\n".join(
+        f"SELECT RAISE(ABORT, 'CHECK constraint failed: {name}') "
+        f"WHERE NOT ({expression.format(row='new.')});"
+        for name, expression in MOVIE_CHECKS.items()
+    )
+    for event in ("INSERT", "UPDATE"):
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS movies_check_{event.lower()} "
+            f"BEFORE {event} ON movies BEGIN\n{body}\nEND"
+        )
+
+def has_check_constraints(conn: sqlite3.Connection) -> bool:
+    """Check whether the movies table was created with the MOVIE_CHECKS constraints"""
+    (sql,) = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'movies'"
+    ).fetchone()
+    return all(f"CONSTRAINT {name}" in sql for name in MOVIE_CHECKS)
+
+def fts_title_query(text: str) -> Optional[str]:
+    """
+    Build an FTS5 prefix query matching every word of text in the title column.
+    
+    Each word is quoted so FTS5 syntax characters in user input are taken
+    literally. Returns None if text has no searchable words.
+    """
+    tokens = FTS_TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return "title : (" + " ".join(f'"{token}"*' for token in tokens) + ")"
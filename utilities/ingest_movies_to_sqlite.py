@@ -4,22 +4,74 @@ from os.path import dirname as up
 sys.path.append(os.path.abspath(os.path.join(up(__file__), os.pardir)))
 
 from utilities.constants import DB_FILE_PATH, CSV_FILE_PATH
+from utilities.db_setup import (
+    RELEASE_YEAR_EXPRESSION,
+    configure_connection,
+    ensure_schema,
+    movie_check_constraints,
+    optimize_connection,
+)
 
-import sqlite3
+try:
+    # Bundles a recent SQLite build; fall back to the one Python ships with
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+from itertools import islice
 import pandas as pd
 
+# Columns loaded from the CSV, in insert order
+MOVIE_COLUMNS = (
+    'release_date', 'title', 'overview', 'popularity', 'vote_count',
+    'vote_average', 'original_language', 'genre', 'poster_url'
+)
 
-def create_database():
-    """Create SQLite database and table"""
+# Settings for the one-shot bulk load only: keep every dirty page in a 256 MB
+# cache and skip journaling and fsyncs; the connection settings are restored afterwards
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA cache_size=-262144",
+    "PRAGMA cache_spill=OFF",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+)
+RESTORE_PRAGMAS = (
+    "PRAGMA cache_spill=ON",
+    "PRAGMA locking_mode=NORMAL",
+)
+INSERT_BATCH_SIZE = 10000
+
+# Larger pages mean shallower B-trees and fewer reads per lookup; SQLite only applies a
+# new page size to an empty database or during a VACUUM outside WAL mode
+PAGE_SIZE = 8192
+
+INSERT_MOVIE_QUERY = f"""
+    INSERT INTO movies ({', '.join(MOVIE_COLUMNS)})
+    VALUES ({', '.join('?' for _ in MOVIE_COLUMNS)})
+"""
+
+
+def create_table():
+    """Create SQLite database and an unindexed movies table ready for a bulk load"""
     # Connect to database (creates it if it doesn't exist)
     conn = sqlite3.connect(DB_FILE_PATH)
     cursor = conn.cursor()
     
-    # Drop table if it exists (for fresh import)
+    # Drop tables if they exist (for fresh import)
+    cursor.execute("DROP TABLE IF EXISTS movies_fts")
+    cursor.execute("DROP TABLE IF EXISTS movie_genres")
+    cursor.execute("DROP TABLE IF EXISTS genres")
     cursor.execute("DROP TABLE IF EXISTS movies")
+    conn.commit()
+    
+    # Rebuild the now empty file with the larger page size, then switch to the usual settings
+    cursor.execute("PRAGMA journal_mode=DELETE")
+    cursor.execute(f"PRAGMA page_size={PAGE_SIZE}")
+    cursor.execute("VACUUM")
+    configure_connection(conn)
     
     # Create movies table with appropriate schema
-    cursor.execute("""
+    cursor.execute(f"""
         CREATE TABLE movies (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             release_date DATE,
@@ -30,16 +82,12 @@ def create_database():
             vote_average REAL,
             original_language TEXT,
             genre TEXT,
-            poster_url TEXT
+            poster_url TEXT,
+            release_year INTEGER GENERATED ALWAYS AS ({RELEASE_YEAR_EXPRESSION}) STORED,
+            {movie_check_constraints()}
         )
     """)
     
-    # Create indexes for better query performance
-    cursor.execute("CREATE INDEX idx_title ON movies(title)")
-    cursor.execute("CREATE INDEX idx_release_date ON movies(release_date)")
-    cursor.execute("CREATE INDEX idx_popularity ON movies(popularity)")
-    cursor.execute("CREATE INDEX idx_vote_average ON movies(vote_average)")
-    
     conn.commit()
     return conn
 
@@ -48,27 +96,23 @@ def ingest_csv_to_sqlite():
     print(f"Starting ingestion from: {CSV_FILE_PATH}")
     
     # Create database and table
-    conn = create_database()
+    conn = create_table()
     
     try:
         # Read CSV file with proper quoting configuration
         print("Reading CSV file...")
         
-        # First, try to detect the file encoding
-        import chardet
-        with open(CSV_FILE_PATH, 'rb') as f:
-            raw_data = f.read(100000)  # Read first 100KB
-            result = chardet.detect(raw_data)
-            encoding = result['encoding']
-            print(f"Detected encoding: {encoding}")
-        
-        # Read with detected encoding and proper CSV handling
-        df = pd.read_csv(CSV_FILE_PATH, 
-                        encoding=encoding or 'utf-8',
-                        quotechar='"',
-                        on_bad_lines='warn',  # Warn about bad lines
-                        engine='python',  # Use Python engine for better error handling
-                        skipinitialspace=True)  # Skip spaces after delimiter
+        # The CSV is expected to be UTF-8; latin-1 decodes any byte sequence as a fallback
+        read_options = dict(quotechar='"',
+                            on_bad_lines='warn',  # Warn about bad lines
+                            engine='c',  # Vectorized C parser
+                            lineterminator='\n',  # Stray carriage returns inside fields are data, not row breaks
+                            skipinitialspace=True)  # Skip spaces after delimiter
+        try:
+            df = pd.read_csv(CSV_FILE_PATH, encoding='utf-8', **read_options)
+        except UnicodeDecodeError:
+            print("CSV is not valid UTF-8, reading it as latin-1")
+            df = pd.read_csv(CSV_FILE_PATH, encoding='latin-1', **read_options)
         
         # Display info about the dataset
         print(f"\nDataset info:")
@@ -106,9 +150,26 @@ def ingest_csv_to_sqlite():
             'Poster_Url': 'poster_url'
         })
         
-        # Insert data into SQLite
+        # Store dates as text like to_sql did, with missing dates as NULL
+        release_dates = df_renamed['release_date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        df_renamed['release_date'] = release_dates.astype(object).where(release_dates.notna(), None)
+        
+        # Insert data into SQLite in one transaction, in batches
         print("Inserting data into SQLite database...")
-        df_renamed.to_sql('movies', conn, if_exists='append', index=False)
+        for pragma in BULK_LOAD_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("BEGIN")
+        rows = df_renamed[list(MOVIE_COLUMNS)].itertuples(index=False, name=None)
+        while batch := list(islice(rows, INSERT_BATCH_SIZE)):
+            conn.executemany(INSERT_MOVIE_QUERY, batch)
+        conn.commit()
+        for pragma in RESTORE_PRAGMAS:
+            conn.execute(pragma)
+        configure_connection(conn)
+        
+        # Build the indexes, full-text index and genre tables once the data is loaded
+        ensure_schema(conn)
+        conn.commit()
         
         # Verify the data was inserted
         cursor = conn.cursor()
@@ -139,6 +200,7 @@ def ingest_csv_to_sqlite():
         print(f"Error during ingestion: {e}")
         conn.rollback()
     finally:
+        optimize_connection(conn)
         conn.close()
         
     print(f"\nDatabase created at: {DB_FILE_PATH}")
@@ -3,43 +3,325 @@ from os.path import dirname as up
 
 sys.path.append(os.path.abspath(os.path.join(up(__file__), os.pardir)))
 
-import sqlite3
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-import pandas as pd
+import base64
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 
 from utilities.constants import DB_FILE_PATH
+# The SQLite driver db_setup picked, so errors raised through its helpers are the ones caught here
+from utilities.db_setup import (
+    configure_connection,
+    ensure_schema,
+    fts_title_query,
+    sqlite3,
+    stored_release_date,
+    sync_movie_genres,
+)
+
+logger = logging.getLogger(__name__)
+
+# Prepared statements kept on the shared connection
+STATEMENT_CACHE_SIZE = 256
+
+# Columns update_movie may change
+UPDATABLE_COLUMNS = frozenset({
+    'title', 'release_date', 'overview', 'popularity', 'vote_count',
+    'vote_average', 'original_language', 'genre', 'poster_url',
+})
+
+# Rows fetched per step by the iter_* methods
+ITER_BATCH_SIZE = 512
+
+# Movies kept by get_movie_by_id, and how long get_statistics results stay fresh
+MOVIE_CACHE_SIZE = 1024
+STATISTICS_TTL = 30.0  # seconds
+
+# YYYY-MM-DD with a plausible month and day, matched against the whole string
+DATE_RE = re.compile(r'\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])')
+
+# Errors reported for the db_setup.MOVIE_CHECKS constraints SQLite enforces on every write
+CONSTRAINT_MESSAGES = {
+    'vote_average_range': "Vote average must be between 0 and 10",
+    'vote_count_nonnegative': "Vote count cannot be negative",
+    'language_code_length': "Language code must be at most 8 characters",
+}
+
+# Search predicates, in the order they appear in the WHERE clause
+SEARCH_CONDITIONS = {
+    'title': "id IN (SELECT rowid FROM movies_fts WHERE movies_fts MATCH ?)",
+    'title_like': "title LIKE ?",
+    'genre': "genre LIKE ?",
+    'language': "original_language = ?",
+    'min_rating': "vote_average >= ?",
+    'max_rating': "vote_average <= ?",
+    'year_from': "release_year >= ?",
+    'year_to': "release_year <= ?",
+    # Keyset pagination: rows after the last one of the previous page
+    'after_cursor': "(popularity, id) < (?, ?)",
+}
+
+# Sort orders accepted by search_movies; only these literals ever reach the SQL text
+ORDER_BY_OPTIONS = {
+    'popularity_desc': 'popularity DESC',
+    'rating_desc': 'vote_average DESC, vote_count DESC',
+    'recent': 'release_date DESC',
+}
+
+# All statistics in one statement, returned as a single JSON object
+STATISTICS_QUERY = """
+WITH summary AS (
+    SELECT COUNT(*) AS total_movies,
+           MIN(release_date) AS first_release,
+           MAX(release_date) AS last_release,
+           AVG(CASE WHEN vote_count > 0 THEN vote_average END) AS average_rating
+    FROM movies
+),
+top_genres AS (
+    SELECT genres.name AS genre, COUNT(*) AS count 
+    FROM movie_genres 
+    JOIN genres ON genres.id = movie_genres.genre_id 
+    GROUP BY movie_genres.genre_id 
+    ORDER BY count DESC 
+    LIMIT 5
+),
+top_languages AS (
+    SELECT original_language, COUNT(*) AS count 
+    FROM movies 
+    GROUP BY original_language 
+    ORDER BY count DESC 
+    LIMIT 5
+)
+SELECT json_object(
+    'total_movies', total_movies,
+    'date_range', json_object('from', first_release, 'to', last_release),
+    'average_rating', average_rating,
+    'top_genres', (SELECT json_group_array(json_object('genre', genre, 'count', count)) FROM top_genres),
+    'top_languages', (SELECT json_group_array(json_object('language', original_language, 'count', count)) FROM top_languages)
+)
+FROM summary
+"""
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _is_insert(query: str) -> bool:
+    """Check whether a SQL string is an INSERT, computed once per distinct query"""
+    return query.strip().upper().startswith('INSERT')
+
+def _constraint_error(error: sqlite3.IntegrityError) -> Exception:
+    """Turn a failed movies CHECK constraint into a ValueError; other errors are returned as is"""
+    for name, message in CONSTRAINT_MESSAGES.items():
+        if f"CHECK constraint failed: {name}" in str(error):
+            return ValueError(message)
+    return error
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _search_sql(filters: Tuple[str, ...], order_clause: str) -> str:
+    """Build the search SQL for one combination of filters and sort order, once per combination"""
+    conditions = [SEARCH_CONDITIONS[name] for name in filters]
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    
+    return f"""
+        SELECT * FROM movies 
+        WHERE {where_clause}
+        ORDER BY {order_clause}
+        LIMIT ?
+        """
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _update_query(columns: Tuple[str, ...]) -> str:
+    """Build the UPDATE SQL for one combination of columns, once per combination"""
+    set_clause = ", ".join(f"{col} = ?" for col in columns)
+    return f"UPDATE movies SET {set_clause} WHERE id = ?"
+
+def _rows_to_dicts(rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+    """Convert result rows to dicts, reading the column names once for the whole result"""
+    if not rows:
+        return []
+    keys = rows[0].keys()
+    return [dict(zip(keys, row)) for row in rows]
+
+def encode_page_cursor(popularity: float, movie_id: int) -> str:
+    """Encode the sort key of the last movie on a page as an opaque cursor string"""
+    return base64.urlsafe_b64encode(json.dumps([popularity, movie_id]).encode()).decode()
+
+def decode_page_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a cursor from encode_page_cursor back into (popularity, id)"""
+    try:
+        popularity, movie_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid page cursor")
+    return popularity, movie_id
+
 
 class MoviesCRUD:
     """CRUD operations for movies database"""
     
     def __init__(self, db_path: str = DB_FILE_PATH):
         self.db_path = db_path
+        self._conn = None
+        # One statement or transaction at a time on the shared connection; reentrant so
+        # methods called inside transaction() can take it again
+        self._lock = threading.RLock()
+        # Read-only connection the iter_* methods read through; its lock only guards
+        # the count of iterations sharing the current read transaction
+        self._reader = None
+        self._reader_lock = threading.Lock()
+        self._reader_users = 0
+        # Read caches, only touched while holding the lock; writes invalidate them
+        self._movie_cache = OrderedDict()
+        self._statistics_cache = None  # (expires_at, JSON payload)
+        # PRAGMA data_version when the caches were last checked; it changes when another
+        # connection, such as the MCP server's, commits to the file
+        self._data_version = None
     
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get the shared database connection, opening it on first use"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            self._conn.row_factory = sqlite3.Row  # Enable column access by name
+            configure_connection(self._conn)
+            # Add the release_year column and indexes the filter queries rely on
+            ensure_schema(self._conn)
+        return self._conn
+    
+    def _get_reader(self):
+        """Get the read-only snapshot connection, opening it on first use; called with the reader lock held"""
+        if self._reader is None:
+            self._reader = sqlite3.connect(
+                Path(self.db_path).resolve().as_uri() + "?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            self._reader.row_factory = sqlite3.Row
+            configure_connection(self._reader)
+        return self._reader
+    
+    def close(self):
+        """Close the shared database connection and the snapshot reader"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+                self._reader_users = 0
+    
+    def _invalidate(self, movie_id: Optional[int] = None):
+        """Drop cached statistics and the cached movie, or every cached movie if no ID is given"""
+        with self._lock:
+            if movie_id is None:
+                self._movie_cache.clear()
+            else:
+                self._movie_cache.pop(movie_id, None)
+            self._statistics_cache = None
+    
+    def _drop_stale_caches(self):
+        """Drop the read caches if another connection changed the database; called with the lock held"""
+        (data_version,) = self._get_connection().execute("PRAGMA data_version").fetchone()
+        if data_version != self._data_version:
+            self._invalidate()
+            self._data_version = data_version
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed operations as one transaction
+        
+        Commits once at the end, so a batch of writes shares a single sync, and
+        rolls everything back if the block raises. Rows rejected by a MOVIE_CHECKS
+        constraint raise ValueError. Other threads wait until the
+        transaction finishes; nested calls join the outer transaction.
+        """
+        with self._lock:
+            conn = self._get_connection()
+            if conn.in_transaction:
+                try:
+                    yield conn
+                except sqlite3.IntegrityError as error:
+                    raise _constraint_error(error)
+                return
+            
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException as error:
+                conn.execute("ROLLBACK")
+                # Reads inside the block may have cached rows that were just rolled back
+                self._invalidate()
+                if isinstance(error, sqlite3.IntegrityError):
+                    raise _constraint_error(error)
+                raise
+            conn.execute("COMMIT")
     
     def _execute_query(self, query: str, params: tuple = (), fetch_one: bool = False):
         """Execute a query and return results"""
-        conn = self._get_connection()
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        cursor = conn.cursor()
-        
-        try:
+        with self._lock:
+            cursor = self._get_connection().cursor()
             cursor.execute(query, params)
             
-            if query.strip().upper().startswith('SELECT'):
+            # SELECT and RETURNING statements produce rows; read them all so the statement completes
+            if cursor.description is not None:
+                result = cursor.fetchall()
                 if fetch_one:
-                    result = cursor.fetchone()
-                else:
-                    result = cursor.fetchall()
+                    return result[0] if result else None
                 return result
             else:
-                conn.commit()
-                return cursor.lastrowid if query.strip().upper().startswith('INSERT') else cursor.rowcount
+                # Outside transaction() the connection autocommits each statement
+                return cursor.lastrowid if _is_insert(query) else cursor.rowcount
+    
+    def _iter_query(self, query: str, params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the rows of a query as dicts, reading ITER_BATCH_SIZE rows at a time
+        
+        Rows are read on the read-only reader connection inside a read transaction,
+        so they come from one snapshot of the database; iterations that overlap share
+        it. Writes and rollbacks on the shared connection never disturb the open
+        cursor, and a slow or abandoned consumer never blocks other callers.
+        """
+        if self.db_path == ':memory:':
+            # An in-memory database cannot be opened a second time, so the whole
+            # result is read at once on the shared connection instead
+            yield from _rows_to_dicts(self._execute_query(query, params))
+            return
+        
+        if self._reader is None:
+            # The shared connection creates the file and the schema the reader relies on
+            with self._lock:
+                self._get_connection()
+        with self._reader_lock:
+            reader = self._get_reader()
+            if self._reader_users == 0:
+                reader.execute("BEGIN")
+            self._reader_users += 1
+        cursor = None
+        try:
+            cursor = reader.execute(query, params)
+            while rows := cursor.fetchmany(ITER_BATCH_SIZE):
+                yield from _rows_to_dicts(rows)
         finally:
-            conn.close()
+            with self._reader_lock:
+                if self._reader is reader:
+                    if cursor is not None:
+                        cursor.close()
+                    self._reader_users -= 1
+                    if self._reader_users == 0:
+                        reader.execute("COMMIT")
     
     # CREATE operations
     def create_movie(self, 
@@ -74,15 +356,8 @@ class MoviesCRUD:
             raise ValueError("Title is required")
         
         # Validate date format if provided
-        if release_date:
-            try:
-                datetime.strptime(release_date, '%Y-%m-%d')
-            except ValueError:
-                raise ValueError("Release date must be in YYYY-MM-DD format")
-        
-        # Validate vote average range
-        if not 0 <= vote_average <= 10:
-            raise ValueError("Vote average must be between 0 and 10")
+        if release_date and not DATE_RE.fullmatch(release_date):
+            raise ValueError("Release date must be in YYYY-MM-DD format")
         
         query = """
         INSERT INTO movies (title, release_date, overview, popularity, vote_count, 
@@ -90,98 +365,153 @@ class MoviesCRUD:
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         
-        params = (title, release_date, overview, popularity, vote_count, 
+        params = (title, stored_release_date(release_date), overview, popularity, vote_count, 
                  vote_average, original_language, genre, poster_url)
         
-        movie_id = self._execute_query(query, params)
-        print(f"✅ Movie '{title}' created with ID: {movie_id}")
+        with self.transaction() as conn:
+            movie_id = conn.execute(query, params).lastrowid
+            sync_movie_genres(conn, movie_id, genre)
+            self._invalidate(movie_id)
+        logger.info("Movie '%s' created with ID: %s", title, movie_id)
         return movie_id
     
     def create_movies_bulk(self, movies_data: List[Dict[str, Any]]) -> int:
         """
         Create multiple movies at once
         
+        A movie whose title and release date are already in the database has its
+        popularity and votes updated instead, so rerunning an import is safe.
+        
         Args:
             movies_data: List of dictionaries containing movie data
             
         Returns:
-            int: Number of movies created
+            int: Number of movies created or updated
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
         query = """
         INSERT INTO movies (title, release_date, overview, popularity, vote_count, 
                           vote_average, original_language, genre, poster_url)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (title, release_date) DO UPDATE SET 
+            popularity = excluded.popularity,
+            vote_count = excluded.vote_count,
+            vote_average = excluded.vote_average
         """
         
-        count = 0
-        try:
-            for movie in movies_data:
-                params = (
-                    movie.get('title'),
-                    movie.get('release_date'),
-                    movie.get('overview', ''),
-                    movie.get('popularity', 0.0),
-                    movie.get('vote_count', 0),
-                    movie.get('vote_average', 0.0),
-                    movie.get('original_language', 'en'),
-                    movie.get('genre', ''),
-                    movie.get('poster_url', '')
-                )
-                cursor.execute(query, params)
-                count += 1
+        params_iter = (
+            (
+                movie.get('title'),
+                # Stored like ingested dates, so re-imported movies hit ON CONFLICT
+                stored_release_date(movie.get('release_date')),
+                movie.get('overview', ''),
+                movie.get('popularity', 0.0),
+                movie.get('vote_count', 0),
+                movie.get('vote_average', 0.0),
+                movie.get('original_language', 'en'),
+                movie.get('genre', ''),
+                movie.get('poster_url', '')
+            )
+            for movie in movies_data
+        )
+        
+        with self.transaction() as conn:
+            # New rows get IDs above the current maximum, since the write lock is held
+            (last_id,) = conn.execute("SELECT IFNULL(MAX(id), 0) FROM movies").fetchone()
             
-            conn.commit()
-            print(f"✅ Successfully created {count} movies")
-            return count
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+            # One prepared statement bound once per row
+            count = conn.executemany(query, params_iter).rowcount
+            
+            new_movies = conn.execute("SELECT id, genre FROM movies WHERE id > ?", (last_id,)).fetchall()
+            for movie_id, genre in new_movies:
+                sync_movie_genres(conn, movie_id, genre)
+            self._invalidate()
+        
+        logger.info("Successfully created or updated %d movies", count)
+        return count
     
     # READ operations
     def get_movie_by_id(self, movie_id: int) -> Optional[Dict[str, Any]]:
-        """Get a movie by its ID"""
-        query = "SELECT * FROM movies WHERE id = ?"
-        result = self._execute_query(query, (movie_id,), fetch_one=True)
-        
-        if result:
-            return dict(result)
-        return None
+        """Get a movie by its ID, served from an LRU cache when it was read recently"""
+        with self._lock:
+            self._drop_stale_caches()
+            movie = self._movie_cache.get(movie_id)
+            if movie is not None:
+                self._movie_cache.move_to_end(movie_id)
+            else:
+                query = "SELECT * FROM movies WHERE id = ?"
+                result = self._execute_query(query, (movie_id,), fetch_one=True)
+                if not result:
+                    return None
+                
+                movie = dict(result)
+                self._movie_cache[movie_id] = movie
+                if len(self._movie_cache) > MOVIE_CACHE_SIZE:
+                    self._movie_cache.popitem(last=False)
+        
+        # Callers get their own copy, so changes to it never reach the cache
+        return dict(movie)
     
-    def get_movies_by_title(self, title_search: str) -> List[Dict[str, Any]]:
-        """Search movies by title (partial match)"""
+    def _title_query(self, title_search: str) -> Tuple[str, tuple]:
+        """Build the SQL and parameters for a title search"""
+        match_query = fts_title_query(title_search)
+        if match_query:
+            query = """
+            SELECT movies.* FROM movies_fts 
+            JOIN movies ON movies.id = movies_fts.rowid 
+            WHERE movies_fts MATCH ? 
+            ORDER BY movies.popularity DESC
+            """
+            return query, (match_query,)
+        
+        # Substring fallback for search terms without any indexable words
         query = """
         SELECT * FROM movies 
         WHERE title LIKE ? 
         ORDER BY popularity DESC
         """
-        results = self._execute_query(query, (f'%{title_search}%',))
-        return [dict(row) for row in results]
+        return query, (f'%{title_search}%',)
+    
+    def get_movies_by_title(self, title_search: str) -> List[Dict[str, Any]]:
+        """Search movies by title (words starting with each search word)"""
+        results = self._execute_query(*self._title_query(title_search))
+        return _rows_to_dicts(results)
+    
+    def iter_movies_by_title(self, title_search: str) -> Iterator[Dict[str, Any]]:
+        """Like get_movies_by_title, but yields movies as they are read"""
+        return self._iter_query(*self._title_query(title_search))
     
     def get_movies_by_genre(self, genre: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get movies by genre"""
+        """Get movies by genre (exact genre name, or a partial match if there is none)"""
         query = """
-        SELECT * FROM movies 
-        WHERE genre LIKE ? 
-        ORDER BY vote_average DESC, vote_count DESC
+        SELECT movies.* FROM genres 
+        JOIN movie_genres ON movie_genres.genre_id = genres.id 
+        JOIN movies ON movies.id = movie_genres.movie_id 
+        WHERE genres.name = ? 
+        ORDER BY movies.vote_average DESC, movies.vote_count DESC
         LIMIT ?
         """
-        results = self._execute_query(query, (f'%{genre}%', limit))
-        return [dict(row) for row in results]
+        results = self._execute_query(query, (genre.strip(), limit))
+        
+        if not results:
+            # Substring fallback for partial genre names
+            query = """
+            SELECT * FROM movies 
+            WHERE genre LIKE ? 
+            ORDER BY vote_average DESC, vote_count DESC
+            LIMIT ?
+            """
+            results = self._execute_query(query, (f'%{genre}%', limit))
+        return _rows_to_dicts(results)
     
     def get_movies_by_year(self, year: int) -> List[Dict[str, Any]]:
         """Get movies released in a specific year"""
         query = """
         SELECT * FROM movies 
-        WHERE strftime('%Y', release_date) = ? 
+        WHERE release_year = ? 
         ORDER BY popularity DESC
         """
-        results = self._execute_query(query, (str(year),))
-        return [dict(row) for row in results]
+        results = self._execute_query(query, (int(year),))
+        return _rows_to_dicts(results)
     
     def get_top_rated_movies(self, min_votes: int = 100, limit: int = 50) -> List[Dict[str, Any]]:
         """Get top-rated movies with minimum vote threshold"""
@@ -192,7 +522,7 @@ class MoviesCRUD:
         LIMIT ?
         """
         results = self._execute_query(query, (min_votes, limit))
-        return [dict(row) for row in results]
+        return _rows_to_dicts(results)
     
     def get_recent_movies(self, days: int = 365) -> List[Dict[str, Any]]:
         """Get movies released in the last N days"""
@@ -202,64 +532,162 @@ class MoviesCRUD:
         ORDER BY release_date DESC
         """
         results = self._execute_query(query, (days,))
-        return [dict(row) for row in results]
+        return _rows_to_dicts(results)
     
-    def search_movies(self, 
-                     title: Optional[str] = None,
-                     genre: Optional[str] = None,
-                     language: Optional[str] = None,
-                     min_rating: Optional[float] = None,
-                     max_rating: Optional[float] = None,
-                     year_from: Optional[int] = None,
-                     year_to: Optional[int] = None,
-                     order_by: str = 'popularity DESC',
-                     limit: int = 100) -> List[Dict[str, Any]]:
-        """
-        Advanced search with multiple filters
-        """
-        conditions = []
+    def _search_filters(self,
+                           title: Optional[str] = None,
+                           genre: Optional[str] = None,
+                           language: Optional[str] = None,
+                           min_rating: Optional[float] = None,
+                           max_rating: Optional[float] = None,
+                           year_from: Optional[int] = None,
+                           year_to: Optional[int] = None) -> Tuple[List[str], List[Any]]:
+        """List the active search filters, in SEARCH_CONDITIONS order, and their parameters"""
+        filters = []
         params = []
         
         if title:
-            conditions.append("title LIKE ?")
-            params.append(f'%{title}%')
+            match_query = fts_title_query(title)
+            if match_query:
+                filters.append("title")
+                params.append(match_query)
+            else:
+                filters.append("title_like")
+                params.append(f'%{title}%')
         
         if genre:
-            conditions.append("genre LIKE ?")
+            filters.append("genre")
             params.append(f'%{genre}%')
         
         if language:
-            conditions.append("original_language = ?")
+            filters.append("language")
             params.append(language)
         
         if min_rating is not None:
-            conditions.append("vote_average >= ?")
+            filters.append("min_rating")
             params.append(min_rating)
         
         if max_rating is not None:
-            conditions.append("vote_average <= ?")
+            filters.append("max_rating")
             params.append(max_rating)
         
         if year_from:
-            conditions.append("strftime('%Y', release_date) >= ?")
-            params.append(str(year_from))
+            filters.append("year_from")
+            params.append(int(year_from))
         
         if year_to:
-            conditions.append("strftime('%Y', release_date) <= ?")
-            params.append(str(year_to))
+            filters.append("year_to")
+            params.append(int(year_to))
         
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return filters, params
+    
+    def _search_query(self,
+                      title: Optional[str] = None,
+                      genre: Optional[str] = None,
+                      language: Optional[str] = None,
+                      min_rating: Optional[float] = None,
+                      max_rating: Optional[float] = None,
+                      year_from: Optional[int] = None,
+                      year_to: Optional[int] = None,
+                      order_by: str = 'popularity_desc',
+                      limit: Optional[int] = 100) -> Tuple[str, tuple]:
+        """Build the SQL and parameters for search_movies; a limit of None returns every match"""
+        if order_by in ORDER_BY_OPTIONS:
+            order_clause = ORDER_BY_OPTIONS[order_by]
+        elif order_by in ORDER_BY_OPTIONS.values():
+            order_clause = order_by
+        else:
+            raise ValueError(f"order_by must be one of: {', '.join(ORDER_BY_OPTIONS)}")
         
-        query = f"""
-        SELECT * FROM movies 
-        WHERE {where_clause}
-        ORDER BY {order_by}
-        LIMIT ?
+        filters, params = self._search_filters(
+            title, genre, language, min_rating, max_rating, year_from, year_to
+        )
+        query = _search_sql(tuple(filters), order_clause)
+        # A negative LIMIT means no limit
+        params.append(-1 if limit is None else limit)
+        
+        return query, tuple(params)
+    
+    def search_movies(self, 
+                     title: Optional[str] = None,
+                     genre: Optional[str] = None,
+                     language: Optional[str] = None,
+                     min_rating: Optional[float] = None,
+                     max_rating: Optional[float] = None,
+                     year_from: Optional[int] = None,
+                     year_to: Optional[int] = None,
+                     order_by: str = 'popularity_desc',
+                     limit: int = 100) -> List[Dict[str, Any]]:
         """
-        params.append(limit)
+        Advanced search with multiple filters
+        
+        order_by is a key of ORDER_BY_OPTIONS; the matching ORDER BY clause itself
+        is also accepted.
+        """
+        results = self._execute_query(*self._search_query(
+            title, genre, language, min_rating, max_rating, year_from, year_to, order_by, limit
+        ))
+        return _rows_to_dicts(results)
+    
+    def iter_search_movies(self,
+                           title: Optional[str] = None,
+                           genre: Optional[str] = None,
+                           language: Optional[str] = None,
+                           min_rating: Optional[float] = None,
+                           max_rating: Optional[float] = None,
+                           year_from: Optional[int] = None,
+                           year_to: Optional[int] = None,
+                           order_by: str = 'popularity_desc',
+                           limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Like search_movies, but yields movies as they are read and has no default limit"""
+        return self._iter_query(*self._search_query(
+            title, genre, language, min_rating, max_rating, year_from, year_to, order_by, limit
+        ))
+    
+    def search_movies_page(self,
+                           title: Optional[str] = None,
+                           genre: Optional[str] = None,
+                           language: Optional[str] = None,
+                           min_rating: Optional[float] = None,
+                           max_rating: Optional[float] = None,
+                           year_from: Optional[int] = None,
+                           year_to: Optional[int] = None,
+                           cursor: Optional[str] = None,
+                           page_size: int = 100) -> Dict[str, Any]:
+        """
+        Search with the same filters as search_movies, one page at a time
+        
+        Pages are ordered by popularity (ties broken by ID) and continue after
+        the last movie of the previous page, so every page costs an index seek
+        instead of the growing skip of LIMIT/OFFSET.
+        
+        Args:
+            cursor: next_cursor from the previous page, or None for the first page
+            page_size: Maximum number of movies per page
+            
+        Returns:
+            dict: 'items' with the movies of this page and 'next_cursor' for the
+            following page (None after the last page)
+        """
+        filters, params = self._search_filters(
+            title, genre, language, min_rating, max_rating, year_from, year_to
+        )
+        
+        if cursor:
+            filters.append("after_cursor")
+            params.extend(decode_page_cursor(cursor))
+        
+        query = _search_sql(tuple(filters), "popularity DESC, id DESC")
+        # One extra row tells whether another page follows
+        params.append(page_size + 1)
         
         results = self._execute_query(query, tuple(params))
-        return [dict(row) for row in results]
+        items = _rows_to_dicts(results[:page_size])
+        
+        next_cursor = None
+        if len(results) > page_size:
+            next_cursor = encode_page_cursor(items[-1]['popularity'], items[-1]['id'])
+        return {'items': items, 'next_cursor': next_cursor}
     
     # UPDATE operations
     def update_movie(self, movie_id: int, **kwargs) -> bool:
@@ -273,34 +701,30 @@ class MoviesCRUD:
         Returns:
             bool: True if update was successful
         """
-        # Get valid column names
-        valid_columns = ['title', 'release_date', 'overview', 'popularity', 
-                        'vote_count', 'vote_average', 'original_language', 
-                        'genre', 'poster_url']
-        
         # Filter out invalid columns
-        updates = {k: v for k, v in kwargs.items() if k in valid_columns}
+        updates = {k: v for k, v in kwargs.items() if k in UPDATABLE_COLUMNS}
         
         if not updates:
             raise ValueError("No valid fields to update")
-        
-        # Validate vote_average if provided
-        if 'vote_average' in updates and not 0 <= updates['vote_average'] <= 10:
-            raise ValueError("Vote average must be between 0 and 10")
+        if 'release_date' in updates:
+            updates['release_date'] = stored_release_date(updates['release_date'])
         
         # Build update query
-        set_clause = ", ".join([f"{col} = ?" for col in updates.keys()])
-        query = f"UPDATE movies SET {set_clause} WHERE id = ?"
+        query = _update_query(tuple(updates))
         
         params = list(updates.values()) + [movie_id]
         
-        rows_affected = self._execute_query(query, tuple(params))
+        with self.transaction() as conn:
+            rows_affected = conn.execute(query, tuple(params)).rowcount
+            if rows_affected > 0 and 'genre' in updates:
+                sync_movie_genres(conn, movie_id, updates['genre'])
+            self._invalidate(movie_id)
         
         if rows_affected > 0:
-            print(f"✅ Movie ID {movie_id} updated successfully")
+            logger.info("Movie ID %s updated successfully", movie_id)
             return True
         else:
-            print(f"❌ Movie ID {movie_id} not found")
+            logger.warning("Movie ID %s not found", movie_id)
             return False
     
     def increment_vote(self, movie_id: int, new_rating: float) -> bool:
@@ -317,37 +741,38 @@ class MoviesCRUD:
         if not 0 <= new_rating <= 10:
             raise ValueError("Rating must be between 0 and 10")
         
-        # Get current movie data
-        movie = self.get_movie_by_id(movie_id)
-        if not movie:
-            return False
-        
-        # Calculate new average
-        current_count = movie['vote_count']
-        current_avg = movie['vote_average']
-        
-        new_count = current_count + 1
-        new_avg = ((current_avg * current_count) + new_rating) / new_count
+        # Update the count and average in one statement; every right-hand side
+        # sees the values from before the update
+        query = """
+        UPDATE movies 
+        SET vote_average = ROUND((vote_average * vote_count + ?) / (vote_count + 1.0), 1),
+            vote_count = vote_count + 1
+        WHERE id = ?
+        RETURNING vote_count, CAST(vote_average AS REAL)
+        """
+        with self._lock:
+            result = self._execute_query(query, (new_rating, movie_id), fetch_one=True)
+            self._invalidate(movie_id)
         
-        # Update movie
-        return self.update_movie(movie_id, vote_count=new_count, vote_average=round(new_avg, 1))
+        if not result:
+            return False
+        logger.info("Movie ID %s updated successfully", movie_id)
+        return True
     
     # DELETE operations
     def delete_movie(self, movie_id: int) -> bool:
         """Delete a movie by ID"""
-        # Check if movie exists first
-        movie = self.get_movie_by_id(movie_id)
+        query = "DELETE FROM movies WHERE id = ? RETURNING title"
+        with self._lock:
+            movie = self._execute_query(query, (movie_id,), fetch_one=True)
+            self._invalidate(movie_id)
+        
         if not movie:
-            print(f"❌ Movie ID {movie_id} not found")
+            logger.warning("Movie ID %s not found", movie_id)
             return False
         
-        query = "DELETE FROM movies WHERE id = ?"
-        rows_affected = self._execute_query(query, (movie_id,))
-        
-        if rows_affected > 0:
-            print(f"✅ Movie '{movie['title']}' (ID: {movie_id}) deleted successfully")
-            return True
-        return False
+        logger.info("Movie '%s' (ID: %s) deleted successfully", movie['title'], movie_id)
+        return True
     
     def delete_movies_by_criteria(self, 
                                  before_date: Optional[str] = None,
@@ -384,76 +809,50 @@ class MoviesCRUD:
         
         where_clause = " AND ".join(conditions)
         
-        # First, count movies to be deleted
+        # First, count movies to be deleted; the write lock keeps the count accurate
         count_query = f"SELECT COUNT(*) FROM movies WHERE {where_clause}"
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(count_query, params)
-        count = cursor.fetchone()[0]
-        
-        if count > 0:
-            # Confirm deletion
-            print(f"⚠️  This will delete {count} movies. Proceeding...")
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(count_query, params)
+            count = cursor.fetchone()[0]
             
-            # Delete movies
-            delete_query = f"DELETE FROM movies WHERE {where_clause}"
-            cursor.execute(delete_query, params)
-            conn.commit()
-            print(f"✅ Deleted {count} movies")
-        else:
-            print("No movies match the deletion criteria")
+            if count > 0:
+                # Confirm deletion
+                logger.info("This will delete %d movies. Proceeding...", count)
+                
+                # Delete movies
+                delete_query = f"DELETE FROM movies WHERE {where_clause}"
+                cursor.execute(delete_query, params)
+                self._invalidate()
+                logger.info("Deleted %d movies", count)
+            else:
+                logger.info("No movies match the deletion criteria")
         
-        conn.close()
         return count
     
     # Utility methods
     def get_statistics(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        stats = {}
-        
-        # Total movies
-        cursor.execute("SELECT COUNT(*) FROM movies")
-        stats['total_movies'] = cursor.fetchone()[0]
-        
-        # Date range
-        cursor.execute("SELECT MIN(release_date), MAX(release_date) FROM movies WHERE release_date IS NOT NULL")
-        min_date, max_date = cursor.fetchone()
-        stats['date_range'] = {'from': min_date, 'to': max_date}
-        
-        # Average rating
-        cursor.execute("SELECT AVG(vote_average) FROM movies WHERE vote_count > 0")
-        stats['average_rating'] = round(cursor.fetchone()[0], 2)
-        
-        # Most common genres
-        cursor.execute("""
-            SELECT genre, COUNT(*) as count 
-            FROM movies 
-            WHERE genre != ''
-            GROUP BY genre 
-            ORDER BY count DESC 
-            LIMIT 5
-        """)
-        stats['top_genres'] = [{'genre': row[0], 'count': row[1]} for row in cursor.fetchall()]
-        
-        # Language distribution
-        cursor.execute("""
-            SELECT original_language, COUNT(*) as count 
-            FROM movies 
-            GROUP BY original_language 
-            ORDER BY count DESC 
-            LIMIT 5
-        """)
-        stats['top_languages'] = [{'language': row[0], 'count': row[1]} for row in cursor.fetchall()]
-        
-        conn.close()
+        """Get database statistics, recomputed at most every STATISTICS_TTL seconds or after another connection writes"""
+        with self._lock:
+            self._drop_stale_caches()
+            now = time.monotonic()
+            if self._statistics_cache and self._statistics_cache[0] > now:
+                payload = self._statistics_cache[1]
+            else:
+                (payload,) = self._execute_query(STATISTICS_QUERY, fetch_one=True)
+                self._statistics_cache = (now + STATISTICS_TTL, payload)
+        
+        # Parsing the cached JSON gives every caller a fresh dict
+        stats = json.loads(payload)
+        stats['average_rating'] = round(stats['average_rating'], 2)
         return stats
 
 
 # Example usage and testing
 if __name__ == "__main__":
+    # Show the CRUD methods' progress messages alongside the demo output
+    logging.basicConfig(level=logging.INFO, format="   %(message)s")
+    
     # Initialize CRUD object
     crud = MoviesCRUD()
     
@@ -515,4 +914,5 @@ if __name__ == "__main__":
     print(f"   Average rating: {stats['average_rating']}")
     print(f"   Top genres: {', '.join([g['genre'] for g in stats['top_genres'][:3]])}")
     
+    crud.close()
     print("\n✅ CRUD operations demonstration completed!")